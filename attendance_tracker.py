@@ -1,12 +1,70 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import datetime
-import pytz
-from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
+from zoneinfo import ZoneInfo
 from config import *
 import base64
+import collections
+import functools
 import sys
-from apscheduler.schedulers.blocking import BlockingScheduler
+import time
+import concurrent.futures
+
+try:
+    import orjson  # Optional: ~3-5x faster JSON decoding for large daily reports
+except ImportError:
+    orjson = None
+
+
+def _parse_json_response(response):
+    """Decode a WebWork JSON response, handling the UTF-8 BOM the API emits."""
+    if orjson is not None:
+        return orjson.loads(response.content.lstrip(b'\xef\xbb\xbf'))
+    response.encoding = 'utf-8-sig'
+    return response.json()
+
+
+def _build_ascii_table(headers, rows):
+    """Build a Slack code-block ASCII table from headers and row lists."""
+    str_rows = [[str(cell) for cell in row] for row in rows]
+    col_widths = [
+        max(len(header), *(len(row[i]) for row in str_rows)) if str_rows else len(header)
+        for i, header in enumerate(headers)
+    ]
+
+    header_line = " | ".join(h.ljust(col_widths[i]) for i, h in enumerate(headers))
+    separator_line = "-|-".join("-" * width for width in col_widths)
+    body_lines = [
+        " | ".join(cell.ljust(col_widths[i]) for i, cell in enumerate(row))
+        for row in str_rows
+    ]
+
+    return "```\n" + "\n".join([header_line, separator_line] + body_lines) + "\n```"
+
+
+# Report row with all fields pre-stringified, so table building is just
+# width computation and joins. Doubles as the (name, email, time, min-late)
+# cell sequence for _build_ascii_table.
+Row = collections.namedtuple("Row", ["name", "email", "arrival_time", "minutes_late"])
+
+
+def _fmt_ampm(dt):
+    """Format a datetime as '%I:%M %p' without the strftime locale machinery."""
+    hour = dt.hour % 12 or 12
+    return f"{hour:02d}:{dt.minute:02d} {'AM' if dt.hour < 12 else 'PM'}"
+
+
+def _bucket_arrival(arrival_min, start_min, sixty_after_min, five_pm_min):
+    """Bucket an arrival given minutes-since-midnight: 0 on-time, 1 late, 2 very late, 3 absent."""
+    if arrival_min <= start_min:
+        return 0
+    if arrival_min < sixty_after_min:
+        return 1
+    if arrival_min < five_pm_min:
+        return 2
+    return 3
+
 
 class AttendanceTracker:
     def __init__(self):
@@ -14,10 +72,61 @@ class AttendanceTracker:
         self.webwork_users_api_url = WEBWORK_USERS_API_URL
         self.webwork_api_user = WEBWORK_API_USER
         self.webwork_api_key = WEBWORK_API_KEY
-        self.slack_client = WebClient(token=SLACK_BOT_TOKEN)
-        self.timezone = pytz.timezone(TIMEZONE)
+        # zoneinfo handles the tzinfo= argument to datetime.combine correctly
+        # (pytz zones need .localize() for that) and skips pytz's per-call
+        # offset lookups.
+        self.timezone = ZoneInfo(TIMEZONE)
         self.hr_project_name = HR_PROJECT_NAME
         self.user_cache = {}  # Cache for user information
+        self._name_for = self._build_name_lookup()
+        self._user_info_fetched_at = 0.0
+        self._daily_cache = {}  # date -> (fetch timestamp, parsed report)
+
+        # Parse configured start times once; they are constants, so there is no
+        # reason to pay for strptime on every check.
+        self.start_time = datetime.datetime.strptime(START_TIME, "%H:%M").time()
+        try:
+            from config import CUSTOM_START_TIMES
+            self.custom_start_times = {
+                email: datetime.datetime.strptime(time_str, "%H:%M").time()
+                for email, time_str in CUSTOM_START_TIMES.items()
+            }
+        except ImportError:
+            self.custom_start_times = {}
+
+        # The manual include/exclude lists are config constants too; import and
+        # freeze them once instead of re-importing on every traversal.
+        try:
+            from config import ADDITIONAL_HR_EMAILS
+            self.additional_hr_emails = frozenset(ADDITIONAL_HR_EMAILS)
+        except ImportError:
+            # Constant not defined; ignore
+            self.additional_hr_emails = frozenset()
+        try:
+            from config import EXCLUDED_EMAILS
+            self.excluded_emails = frozenset(EXCLUDED_EMAILS)
+        except ImportError:
+            self.excluded_emails = frozenset()
+
+        # Slack posts run on this pool so the ~200-500 ms HTTPS round-trip
+        # overlaps the diagnostics and sheet work that follow a report.
+        self._slack_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+
+        # Reuse one keep-alive session for all WebWork calls instead of a fresh
+        # TCP+TLS handshake per request. Auth header is encoded once here.
+        self.session = requests.Session()
+        self.session.headers.update(self.get_auth_header())
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+        ))
+
+    @functools.cached_property
+    def slack_client(self):
+        """Slack client, created on first use so report-free paths skip the import."""
+        from slack_sdk import WebClient
+        return WebClient(token=SLACK_BOT_TOKEN)
 
     def get_today_date(self):
         """Get today's date in YYYY-MM-DD format"""
@@ -42,35 +151,60 @@ class AttendanceTracker:
     def fetch_webwork_data(self, date):
         """Fetch attendance data from WebWork API using Basic Authentication"""
         try:
-            response = requests.get(
+            response = self.session.get(
                 self.webwork_api_url,
                 params={
                     "start_date": date,
                     "end_date": date
-                },
-                headers=self.get_auth_header()
+                }
             )
             response.raise_for_status()
-            # Handle UTF-8 BOM if present
-            response.encoding = 'utf-8-sig'
-            return response.json()
+            return _parse_json_response(response)
         except requests.exceptions.RequestException as e:
             print(f"Error fetching WebWork data: {e}")
             if hasattr(e.response, 'text'):
                 print(f"Response content: {e.response.text}")
             return None
 
+    def fetch_webwork_data_range(self, start_date, end_date):
+        """Fetch attendance data for an inclusive date range in one request.
+
+        Returns {date_str: daily-shaped payload} so callers can reuse the
+        per-day processing, or None when the range either fails or cannot
+        be split by day (time entries only carry HH:MM times, so a payload
+        without per-report dates is ambiguous) — fall back to per-day
+        fetches in that case."""
+        try:
+            response = self.session.get(
+                self.webwork_api_url,
+                params={
+                    "start_date": start_date,
+                    "end_date": end_date
+                }
+            )
+            response.raise_for_status()
+            data = _parse_json_response(response)
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching WebWork data range: {e}")
+            return None
+
+        if start_date == end_date:
+            return {start_date: data}
+
+        by_day = {}
+        for report in (data or {}).get("dateReport", []):
+            day = report.get("date")
+            if not day:
+                return None
+            by_day.setdefault(day, []).append(report)
+        return {day: {"dateReport": reports} for day, reports in by_day.items()}
+
     def fetch_user_info(self):
         """Fetch user information from WebWork API"""
         try:
-            response = requests.get(
-                self.webwork_users_api_url,
-                headers=self.get_auth_header()
-            )
+            response = self.session.get(self.webwork_users_api_url)
             response.raise_for_status()
-            # Handle UTF-8 BOM if present
-            response.encoding = 'utf-8-sig'
-            users = response.json()
+            users = _parse_json_response(response)
             for user in users:
                 if 'email' in user:
                     self.user_cache[user['email']] = {
@@ -78,16 +212,53 @@ class AttendanceTracker:
                         'email': user['email']
                     }
             print(f"Successfully fetched information for {len(self.user_cache)} users")
+            # Rebuild the memoized lookup so refreshed entries are picked up.
+            self._name_for = self._build_name_lookup()
+            self._user_info_fetched_at = time.time()
         except requests.exceptions.RequestException as e:
             print(f"Error fetching user information: {e}")
             if hasattr(e.response, 'text'):
                 print(f"Response content: {e.response.text}")
 
+    def _build_name_lookup(self):
+        """Build a memoized email -> display-name lookup over the user cache."""
+        return functools.lru_cache(maxsize=None)(
+            lambda email: self.user_cache.get(email, {}).get('name') or email
+        )
+
+    def fetch_all(self, date, *, max_age_s=0):
+        """Fetch user info and the daily report concurrently.
+
+        The two endpoints are independent, so overlapping them over the shared
+        keep-alive session roughly halves the WebWork round-trip time.
+
+        A report fetched within the last *max_age_s* seconds is reused from the
+        in-memory per-date cache, and the user directory is only refreshed when
+        it is more than two hours old (names change far less often than time
+        entries)."""
+        now = time.time()
+        need_users = now - self._user_info_fetched_at > 7200
+
+        cached = self._daily_cache.get(date)
+        if cached is not None and now - cached[0] <= max_age_s:
+            if need_users:
+                self.fetch_user_info()
+            return cached[1]
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            users_future = executor.submit(self.fetch_user_info) if need_users else None
+            data_future = executor.submit(self.fetch_webwork_data, date)
+            if users_future is not None:
+                users_future.result()
+            data = data_future.result()
+
+        if data is not None:
+            self._daily_cache[date] = (time.time(), data)
+        return data
+
     def get_user_name(self, email):
         """Get user's full name from cache"""
-        if email in self.user_cache and self.user_cache[email]['name']:
-            return self.user_cache[email]['name']
-        return email  # Fallback to email if name not found
+        return self._name_for(email)  # Falls back to the email if name not found
 
     def get_hr_team_members(self, data):
         """Extract HR team members from the Internal CCDOCS-HR project"""
@@ -97,101 +268,119 @@ class AttendanceTracker:
             print("No data received from WebWork API")
             return hr_team_emails
 
+        hr_name = self.hr_project_name  # local binding keeps the inner loop tight
         for report in data["dateReport"]:
             for project in report.get("projects", []):
-                if project.get("projectName") == self.hr_project_name:
+                if project.get("projectName") == hr_name:
                     email = report.get("email")
                     if email:
                         hr_team_emails.add(email)
                     break
 
-        # Include manually specified HR members
-        try:
-            from config import ADDITIONAL_HR_EMAILS
-            hr_team_emails.update(ADDITIONAL_HR_EMAILS)
-        except ImportError:
-            # Constant not defined; ignore
-            pass
-
-        # Exclude specific emails
-        try:
-            from config import EXCLUDED_EMAILS
-            hr_team_emails -= set(EXCLUDED_EMAILS)
-        except ImportError:
-            pass  # No exclusions defined
+        # Include manually specified HR members, minus exclusions
+        hr_team_emails = frozenset(hr_team_emails | self.additional_hr_emails) - self.excluded_emails
 
         if not hr_team_emails:
             print(f"No team members found in project: {self.hr_project_name}")
         else:
             print(f"Found {len(hr_team_emails)} total team members (including additional list, minus exclusions)")
 
-        return list(hr_team_emails)
+        return hr_team_emails
 
-    def get_joining_times(self, data, *, target_date: datetime.date | None = None):
+    def get_joining_times(self, data, hr_team_emails=None, *, target_date: datetime.date | None = None):
         """Get joining times for all HR team members (or Absent) for a specific date.
 
         Parameters
         ----------
         data : dict
             JSON payload from WebWork daily-timeline API.
+        hr_team_emails : collection of str, optional
+            Pre-derived HR team (e.g. from ``get_hr_team_members``). When given,
+            membership detection is skipped and only first entries are collected.
         target_date : datetime.date, optional
             The date that *data* corresponds to. Defaults to today (in the configured timezone).
         """
         joining_times = []
-        hr_team_emails = set(self.get_hr_team_members(data))
 
         if target_date is None:
             target_date = datetime.datetime.now(self.timezone).date()
-        present_emails = set()
-        first_entries = {}
 
-        for report in data.get("dateReport", []):
+        additional_hr = self.additional_hr_emails
+        excluded = self.excluded_emails
+        known_hr = set(hr_team_emails) if hr_team_emails is not None else None
+
+        # Single pass: detect HR membership and track the earliest beginDatetime
+        # per email at the same time. "HH:MM" strings sort chronologically, so we
+        # keep the lexicographic minimum and only build a datetime once per user.
+        hr_team_emails = known_hr if known_hr is not None else set(additional_hr)
+        first_entry_strs = {}
+        hr_name = self.hr_project_name
+
+        for report in (data or {}).get("dateReport", []):
             email = report.get("email")
-            if email not in hr_team_emails:
+            if not email:
                 continue
-            first_entry = None
-            for project in report.get("projects", []):
+            projects = report.get("projects", [])
+            if known_hr is not None:
+                if email not in known_hr:
+                    continue
+            else:
+                is_hr = email in additional_hr or any(
+                    project.get("projectName") == hr_name for project in projects
+                )
+                if not is_hr:
+                    continue
+                hr_team_emails.add(email)
+            min_str = first_entry_strs.get(email)
+            for project in projects:
                 for task in project.get("tasks", []):
                     for time_entry in task.get("timeEntries", []):
-                        begin_time = self.parse_time(time_entry["beginDatetime"], target_date)
-                        if begin_time and (first_entry is None or begin_time < first_entry):
-                            first_entry = begin_time
-            if first_entry:
-                present_emails.add(email)
-                first_entries[email] = first_entry
+                        begin_str = time_entry["beginDatetime"]
+                        if min_str is None or begin_str < min_str:
+                            min_str = begin_str
+            if min_str is not None:
+                first_entry_strs[email] = min_str
+
+        if known_hr is None:
+            hr_team_emails -= excluded
+
+        first_entries = {}
+        for email, min_str in first_entry_strs.items():
+            if email not in hr_team_emails:
+                continue
+            begin_time = self.parse_time(min_str, target_date)
+            if begin_time:
+                first_entries[email] = begin_time
+
+        if not hr_team_emails:
+            print(f"No team members found in project: {self.hr_project_name}")
+        else:
+            print(f"Found {len(hr_team_emails)} total team members (including additional list, minus exclusions)")
 
         for email in hr_team_emails:
             name = self.get_user_name(email)
             if email in first_entries:
-                joining_times.append({
-                    "email": email,
-                    "name": name,
-                    "arrival_time": first_entries[email].strftime("%I:%M %p")
-                })
+                joining_times.append(Row(name, email, _fmt_ampm(first_entries[email]), ""))
             else:
-                joining_times.append({
-                    "email": email,
-                    "name": name,
-                    "arrival_time": "Absent"
-                })
+                joining_times.append(Row(name, email, "Absent", ""))
         return joining_times, first_entries, hr_team_emails
 
     def get_late_arrivals(self, first_entries):
         """Get late arrivals from first_entries dict"""
         late_arrivals = []
-        today_date = datetime.datetime.now(self.timezone).date()
-        start_time = datetime.datetime.strptime(START_TIME, "%H:%M").time()
-        start_datetime = datetime.datetime.combine(today_date, start_time, tzinfo=self.timezone)
-        late_threshold = start_datetime + datetime.timedelta(minutes=LATE_THRESHOLD_MINUTES)
+        # Same-day comparison, so integer minutes-since-midnight beat building
+        # tz-aware datetimes and timedeltas per user.
+        start_min = self.start_time.hour * 60 + self.start_time.minute
+        late_threshold_min = start_min + LATE_THRESHOLD_MINUTES
         for email, first_entry in first_entries.items():
-            if first_entry > late_threshold:
-                minutes_late = int((first_entry - start_datetime).total_seconds() / 60)
-                late_arrivals.append({
-                    "email": email,
-                    "name": self.get_user_name(email),
-                    "arrival_time": first_entry.strftime("%I:%M %p"),
-                    "minutes_late": minutes_late
-                })
+            arrival_min = first_entry.hour * 60 + first_entry.minute
+            if arrival_min > late_threshold_min:
+                late_arrivals.append(Row(
+                    self.get_user_name(email),
+                    email,
+                    _fmt_ampm(first_entry),
+                    str(arrival_min - start_min)
+                ))
         return late_arrivals
 
     def get_absentees(self, hr_team_emails, first_entries):
@@ -199,29 +388,15 @@ class AttendanceTracker:
         absentees = []
         for email in hr_team_emails:
             if email not in first_entries:
-                absentees.append({
-                    "email": email,
-                    "name": self.get_user_name(email)
-                })
+                absentees.append(Row(self.get_user_name(email), email, "", ""))
         return absentees
 
     def categorize_attendance(self, first_entries, hr_team_emails):
         """Categorise team members into On-time, Late, Very-late (initially absent) and Absent."""
-        today_date = datetime.datetime.now(self.timezone).date()
-
-        # Define default cut-off times based on START_TIME
-        start_time_default = datetime.datetime.strptime(START_TIME, "%H:%M").time()
-        start_datetime_default = datetime.datetime.combine(today_date, start_time_default, tzinfo=self.timezone)
-
-        five_minutes_after_default = start_datetime_default + datetime.timedelta(minutes=5)
-        thirty_minutes_after_default = start_datetime_default + datetime.timedelta(minutes=30)
-        five_pm_datetime = datetime.datetime.combine(today_date, datetime.time(17, 0), tzinfo=self.timezone)
-
-        # Import per-user overrides lazily to avoid circular import at top
-        try:
-            from config import CUSTOM_START_TIMES  # type: ignore
-        except ImportError:
-            CUSTOM_START_TIMES = {}
+        # All first entries fall on the same local day, so bucketing works on
+        # integer minutes-since-midnight instead of tz-aware datetime maths.
+        start_min_default = self.start_time.hour * 60 + self.start_time.minute
+        five_pm_min = 17 * 60
 
         on_time = []                    # Logged in <= 5 minutes after start
         late = []                       # Logged in between 5–30 minutes after start
@@ -232,109 +407,87 @@ class AttendanceTracker:
             name = self.get_user_name(email)
             first_entry = first_entries.get(email)
 
-            # Determine per-user start datetime (allows late shift workers)
-            if email in CUSTOM_START_TIMES:
-                custom_start_time = datetime.datetime.strptime(CUSTOM_START_TIMES[email], "%H:%M").time()
-                start_dt = datetime.datetime.combine(today_date, custom_start_time, tzinfo=self.timezone)
-                start_cutoff = start_dt
-                sixty_after = start_dt + datetime.timedelta(minutes=60)
-            else:
-                start_dt = start_datetime_default
-                start_cutoff = start_dt
-                sixty_after = start_dt + datetime.timedelta(minutes=60)
-
             if not first_entry:
                 # Never logged in – Absent
-                absentees.append({"email": email, "name": name})
+                absentees.append(Row(name, email, "", ""))
                 continue
 
-            if first_entry <= start_cutoff:
-                on_time.append({
-                    "email": email,
-                    "name": name,
-                    "arrival_time": first_entry.strftime("%I:%M %p")
-                })
-            elif first_entry < sixty_after:
-                minutes_late = int((first_entry - start_dt).total_seconds() / 60)
-                late.append({
-                    "email": email,
-                    "name": name,
-                    "arrival_time": first_entry.strftime("%I:%M %p"),
-                    "minutes_late": minutes_late
-                })
-            elif first_entry < five_pm_datetime:
-                minutes_late = int((first_entry - start_dt).total_seconds() / 60)
-                very_late.append({
-                    "email": email,
-                    "name": name,
-                    "arrival_time": first_entry.strftime("%I:%M %p"),
-                    "minutes_late": minutes_late
-                })
+            # Determine per-user start time (allows late shift workers)
+            custom_start = self.custom_start_times.get(email)
+            if custom_start is not None:
+                start_min = custom_start.hour * 60 + custom_start.minute
+            else:
+                start_min = start_min_default
+
+            arrival_min = first_entry.hour * 60 + first_entry.minute
+            bucket = _bucket_arrival(arrival_min, start_min, start_min + 60, five_pm_min)
+
+            if bucket == 0:
+                on_time.append(Row(name, email, _fmt_ampm(first_entry), ""))
+            elif bucket == 1:
+                late.append(Row(name, email, _fmt_ampm(first_entry), str(arrival_min - start_min)))
+            elif bucket == 2:
+                very_late.append(Row(name, email, _fmt_ampm(first_entry), str(arrival_min - start_min)))
             else:
                 # Logged in at/after 5 PM – still considered Absent
-                absentees.append({"email": email, "name": name})
+                absentees.append(Row(name, email, "", ""))
 
         return on_time, late, very_late, absentees
 
-    def send_slack_report(self, on_time, late, very_late, absentees, *, include_very_late: bool = True):
-        """Send attendance report (usually 09:30) including on-time, late and optionally >30-min late, plus absentees."""
+    def _post_to_slack(self, text, success_msg):
+        """Submit a chat_postMessage off the critical path and log its outcome."""
+        future = self._slack_executor.submit(
+            self.slack_client.chat_postMessage, channel=SLACK_CHANNEL_ID, text=text
+        )
 
-        # Helper to build an ASCII table inside a code block
-        def build_table(headers, rows):
-            col_widths = [len(h) for h in headers]
-            for row in rows:
-                for i, cell in enumerate(row):
-                    col_widths[i] = max(col_widths[i], len(str(cell)))
+        from slack_sdk.errors import SlackApiError
 
-            # Build separator and header lines
-            header_line = " | ".join(h.ljust(col_widths[i]) for i, h in enumerate(headers))
-            separator_line = "-|-".join("-" * col_widths[i] for i in range(len(headers)))
+        def _log_result(completed):
+            try:
+                completed.result()
+                print(success_msg)
+            except SlackApiError as e:
+                print(f"Error posting to Slack: {e.response['error']}")
 
-            body_lines = [
-                " | ".join(str(cell).ljust(col_widths[i]) for i, cell in enumerate(row))
-                for row in rows
-            ]
+        future.add_done_callback(_log_result)
+        return future
 
-            return "```\n" + "\n".join([header_line, separator_line] + body_lines) + "\n```"
+    def send_slack_report(self, on_time, late, very_late, absentees, *, include_very_late: bool = True):
+        """Send attendance report (usually 09:30) including on-time, late and optionally >30-min late, plus absentees."""
 
         message_parts = [f"<@{SLACK_USER_ID}> *Attendance Report*\n"]
 
         # On-time section
         message_parts.append("*On-time Arrivals*")
         if on_time:
-            ot_rows = [[e["name"], e["email"], e["arrival_time"]] for e in on_time]
-            message_parts.append(build_table(["Name", "Email", "Time"], ot_rows))
+            message_parts.append(_build_ascii_table(["Name", "Email", "Time"], [row[:3] for row in on_time]))
         else:
             message_parts.append("No on-time arrivals.")
 
         # Late (5-30 min) section
         message_parts.append("\n*Late Arrivals (5-30 min)*")
         if late:
-            late_rows = [[e["name"], e["email"], e["arrival_time"], e["minutes_late"]] for e in late]
-            message_parts.append(build_table(["Name", "Email", "Time", "Min Late"], late_rows))
+            message_parts.append(_build_ascii_table(["Name", "Email", "Time", "Min Late"], late))
         else:
             message_parts.append("No late arrivals.")
 
         if include_very_late:
             message_parts.append("\n*Initially Absent but Marked Late (>30 min)*")
             if very_late:
-                vl_rows = [[e["name"], e["email"], e["arrival_time"], e["minutes_late"]] for e in very_late]
-                message_parts.append(build_table(["Name", "Email", "Time", "Min Late"], vl_rows))
+                message_parts.append(_build_ascii_table(["Name", "Email", "Time", "Min Late"], very_late))
             else:
                 message_parts.append("None.")
 
         # Absentees
         message_parts.append("\n*Absent*")
         if absentees:
-            ab_rows = [[e["name"], e["email"]] for e in absentees]
-            message_parts.append(build_table(["Name", "Email"], ab_rows))
+            message_parts.append(_build_ascii_table(["Name", "Email"], [row[:2] for row in absentees]))
         else:
             message_parts.append("No absentees.")
 
         # Combine and send
         final_message = "\n".join(message_parts)
-        self.slack_client.chat_postMessage(channel=SLACK_CHANNEL_ID, text=final_message)
-        print(f"Successfully sent report to Slack channel {SLACK_CHANNEL_ID}")
+        self._post_to_slack(final_message, f"Successfully sent report to Slack channel {SLACK_CHANNEL_ID}")
 
     def send_absent_report(self, absentees):
         """Send a dedicated Absent report (used at 10:05 AM)."""
@@ -342,71 +495,41 @@ class AttendanceTracker:
         if not absentees:
             text = f"<@{SLACK_USER_ID}> No absentees as of 10:05 AM!"
         else:
-            # Reuse the table builder used in send_slack_report
-            def build_table(headers, rows):
-                col_widths = [len(h) for h in headers]
-                for row in rows:
-                    for i, cell in enumerate(row):
-                        col_widths[i] = max(col_widths[i], len(str(cell)))
-
-                header_line = " | ".join(h.ljust(col_widths[i]) for i, h in enumerate(headers))
-                separator_line = "-|-".join("-" * col_widths[i] for i in range(len(headers)))
-                body_lines = [
-                    " | ".join(str(cell).ljust(col_widths[i]) for i, cell in enumerate(row))
-                    for row in rows
-                ]
-                return "```\n" + "\n".join([header_line, separator_line] + body_lines) + "\n```"
-
-            table = build_table(["Name", "Email"], [[e["name"], e["email"]] for e in absentees])
+            table = _build_ascii_table(["Name", "Email"], [row[:2] for row in absentees])
             text = f"<@{SLACK_USER_ID}> *Absent Report (10:05 AM)*\n" + table
 
-        self.slack_client.chat_postMessage(channel=SLACK_CHANNEL_ID, text=text)
-        print("Sent Absent report to Slack.")
+        self._post_to_slack(text, "Sent Absent report to Slack.")
 
     def send_end_of_day_report(self, very_late, absentees):
         """Send 5 PM report listing those who were initially absent (>30 min) and final absentees."""
 
-        def build_table(headers, rows):
-            col_widths = [len(h) for h in headers]
-            for row in rows:
-                for i, cell in enumerate(row):
-                    col_widths[i] = max(col_widths[i], len(str(cell)))
-
-            header_line = " | ".join(h.ljust(col_widths[i]) for i, h in enumerate(headers))
-            separator_line = "-|-".join("-" * col_widths[i] for i in range(len(headers)))
-            body_lines = [
-                " | ".join(str(cell).ljust(col_widths[i]) for i, cell in enumerate(row))
-                for row in rows
-            ]
-            return "```\n" + "\n".join([header_line, separator_line] + body_lines) + "\n```"
-
         message_parts = [f"<@{SLACK_USER_ID}> *End-of-Day Attendance Summary*\n"]
 
         # Initially Absent but Marked Late (>30 min)
         message_parts.append("*Marked Late (>30 min)*")
         if very_late:
-            vl_rows = [[e["name"], e["email"], e["arrival_time"], e["minutes_late"]] for e in very_late]
-            message_parts.append(build_table(["Name", "Email", "Time", "Min Late"], vl_rows))
+            message_parts.append(_build_ascii_table(["Name", "Email", "Time", "Min Late"], very_late))
         else:
             message_parts.append("None.")
 
         # Absentees
         message_parts.append("\n*Absent*")
         if absentees:
-            ab_rows = [[e["name"], e["email"]] for e in absentees]
-            message_parts.append(build_table(["Name", "Email"], ab_rows))
+            message_parts.append(_build_ascii_table(["Name", "Email"], [row[:2] for row in absentees]))
         else:
             message_parts.append("No absentees.")
 
         final_message = "\n".join(message_parts)
-        self.slack_client.chat_postMessage(channel=SLACK_CHANNEL_ID, text=final_message)
-        print("Sent End-of-Day report to Slack.")
+        self._post_to_slack(final_message, "Sent End-of-Day report to Slack.")
 
     def run_end_of_day_check(self):
         """Run at 17:00 to send very_late + absentees report."""
         print(f"Starting end-of-day attendance check for {self.get_today_date()}")
-        self.fetch_user_info()
-        data = self.fetch_webwork_data(self.get_today_date())
+        data = self.fetch_all(self.get_today_date())
+        if data is None:
+            # A failed fetch would make everyone look absent; don't report on it.
+            print("WebWork fetch failed — skipping end-of-day report.", file=sys.stderr)
+            return
         _, first_entries, hr_team_emails = self.get_joining_times(data)
         _on_time, _late, very_late, absentees = self.categorize_attendance(first_entries, hr_team_emails)
         self.send_end_of_day_report(very_late, absentees)
@@ -415,8 +538,11 @@ class AttendanceTracker:
     def run_daily_check(self):
         """Run the daily attendance check"""
         print(f"Starting daily attendance check for {self.get_today_date()}")
-        self.fetch_user_info()
-        data = self.fetch_webwork_data(self.get_today_date())
+        data = self.fetch_all(self.get_today_date())
+        if data is None:
+            # A failed fetch would make everyone look absent; don't report on it.
+            print("WebWork fetch failed — skipping daily report.", file=sys.stderr)
+            return
         _, first_entries, hr_team_emails = self.get_joining_times(data)
         on_time, late, very_late, absentees = self.categorize_attendance(first_entries, hr_team_emails)
         self.send_slack_report(on_time, late, very_late, absentees, include_very_late=False)
@@ -434,12 +560,13 @@ class AttendanceTracker:
         projects = set()
         if not data or "dateReport" not in data:
             return projects
+        add_project = projects.add
         for report in data["dateReport"]:
             if report.get("email") == email:
                 for project in report.get("projects", []):
                     pname = project.get("projectName")
                     if pname:
-                        projects.add(pname)
+                        add_project(pname)
         return projects
 
 if __name__ == "__main__":
@@ -448,9 +575,13 @@ if __name__ == "__main__":
         tracker = AttendanceTracker()
         tracker.run_daily_check()
     else:
+        # Scheduler deps are only needed for the long-running mode; keep the
+        # --once path free of the apscheduler import cost.
+        from apscheduler.schedulers.blocking import BlockingScheduler
+
         tracker = AttendanceTracker()
 
-        eastern = pytz.timezone("US/Eastern")
+        eastern = ZoneInfo("US/Eastern")
 
         scheduler = BlockingScheduler(timezone=eastern)
 
@@ -41,9 +41,12 @@ def debug_data_structure():
             # Show first employee structure
             print(f"First employee structure: {employees[0]}")
             
-            # Calculate statuses
+            # Calculate statuses (bulk API, one call covers every department)
             start_dt = datetime.datetime.combine(today, datetime.datetime.strptime("09:00", "%H:%M").time(), tzinfo=reporter.tz)
-            present, late, initially_absent, absent = reporter._calculate_statuses(employees, first_entries, start_dt)
+            statuses = reporter._calculate_statuses_bulk(
+                {test_dept: employees}, first_entries, {test_dept: start_dt}
+            )
+            present, late, initially_absent, absent = statuses[test_dept]
             
             print(f"\nStatus counts:")
             print(f"  Present: {len(present)}")
@@ -1,209 +1,434 @@
-#!/usr/bin/env python3
-"""
-Email automation module for sending attendance notifications to late and absent employees.
-"""
-
-import os
-import pickle
-import base64
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-import datetime
-from config import (
-    EMAIL_AUTOMATION_ENABLED,
-    EMAIL_SENDER,
-    HR_EMAIL,
-    GMAIL_OAUTH_CREDENTIALS,
-    EMAIL_TEMPLATES
-)
-
-# Gmail API scope for sending emails
-SCOPES = ['https://www.googleapis.com/auth/gmail.send']
-
-
-class EmailAutomation:
-    """Handles automated email notifications for attendance."""
-    
-    def __init__(self):
-        self.service = None
-        self.sender_email = EMAIL_SENDER
-        self.hr_email = HR_EMAIL
-        
-        if EMAIL_AUTOMATION_ENABLED:
-            self._authenticate()
-    
-    def _authenticate(self):
-        """Authenticate with Gmail API using OAuth2."""
-        creds = None
-        token_file = 'token.pickle'
-        
-        # Token file stores the user's access and refresh tokens
-        if os.path.exists(token_file):
-            with open(token_file, 'rb') as token:
-                creds = pickle.load(token)
-        
-        # If there are no (valid) credentials available, let the user log in
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-            else:
-                # Create credentials from the config
-                flow = InstalledAppFlow.from_client_config(
-                    GMAIL_OAUTH_CREDENTIALS, SCOPES)
-                creds = flow.run_local_server(port=0)
-            
-            # Save the credentials for the next run
-            with open(token_file, 'wb') as token:
-                pickle.dump(creds, token)
-        
-        try:
-            self.service = build('gmail', 'v1', credentials=creds)
-            print("Email automation: Successfully authenticated with Gmail API")
-        except Exception as e:
-            print(f"Email automation: Failed to authenticate - {e}")
-            self.service = None
-    
-    def _create_message(self, to, subject, body):
-        """Create an email message."""
-        message = MIMEMultipart()
-        message['to'] = to
-        message['from'] = self.sender_email
-        message['subject'] = subject
-        
-        # Attach the body
-        message.attach(MIMEText(body, 'plain'))
-        
-        # Encode the message
-        raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
-        return {'raw': raw_message}
-    
-    def _send_message(self, message):
-        """Send an email message."""
-        if not self.service:
-            print("Email automation: Service not initialized, skipping email")
-            return False
-        
-        try:
-            result = self.service.users().messages().send(
-                userId='me', body=message).execute()
-            print(f"Email sent successfully: {result['id']}")
-            return True
-        except HttpError as error:
-            print(f'An error occurred while sending email: {error}')
-            return False
-    
-    def send_late_notification(self, employee_data, date, start_time):
-        """Send notification to a late employee."""
-        if not EMAIL_AUTOMATION_ENABLED:
-            return
-        
-        # Prepare template variables
-        template_vars = {
-            'name': employee_data['name'],
-            'date': date.strftime('%Y-%m-%d'),
-            'check_in_time': employee_data['arrival_time'],
-            'expected_time': start_time.strftime('%I:%M %p'),
-            'minutes_late': employee_data['minutes_late'],
-            'hr_email': self.hr_email
-        }
-        
-        # Get template
-        template = EMAIL_TEMPLATES['late']
-        subject = template['subject']
-        body = template['body'].format(**template_vars)
-        
-        # Create and send message
-        message = self._create_message(
-            to=employee_data['email'],
-            subject=subject,
-            body=body
-        )
-        
-        success = self._send_message(message)
-        if success:
-            print(f"  📧 Sent late notification to {employee_data['name']} ({employee_data['email']})")
-        else:
-            print(f"  ❌ Failed to send late notification to {employee_data['name']} ({employee_data['email']})")
-        
-        return success
-    
-    def send_absent_notification(self, employee_data, date):
-        """Send notification to an absent employee."""
-        if not EMAIL_AUTOMATION_ENABLED:
-            return
-        
-        # Prepare template variables
-        template_vars = {
-            'name': employee_data['name'],
-            'date': date.strftime('%Y-%m-%d'),
-            'hr_email': self.hr_email
-        }
-        
-        # Get template
-        template = EMAIL_TEMPLATES['absent']
-        subject = template['subject']
-        body = template['body'].format(**template_vars)
-        
-        # Create and send message
-        message = self._create_message(
-            to=employee_data['email'],
-            subject=subject,
-            body=body
-        )
-        
-        success = self._send_message(message)
-        if success:
-            print(f"  📧 Sent absent notification to {employee_data['name']} ({employee_data['email']})")
-        else:
-            print(f"  ❌ Failed to send absent notification to {employee_data['name']} ({employee_data['email']})")
-        
-        return success
-    
-    def send_batch_notifications(self, attendance_data, date, department_start_times):
-        """Send batch notifications for all late and absent employees."""
-        if not EMAIL_AUTOMATION_ENABLED:
-            print("Email automation is disabled")
-            return
-        
-        print("\n--- Starting Email Notifications ---")
-        
-        late_count = 0
-        absent_count = 0
-        
-        for department, data in attendance_data.items():
-            start_time = department_start_times.get(department)
-            
-            # Send notifications to late employees
-            for employee in data.get('late', []):
-                self.send_late_notification(employee, date, start_time)
-                late_count += 1
-            
-            # Send notifications to absent employees
-            for employee in data.get('absent', []):
-                self.send_absent_notification(employee, date)
-                absent_count += 1
-        
-        print(f"\n📧 Email Summary: Sent {late_count} late notifications, {absent_count} absent notifications")
-        print("--- Email Notifications Complete ---\n")
-
-
-# Utility function for one-time setup
-def setup_gmail_oauth():
-    """Run this to set up Gmail OAuth for the first time."""
-    print("Setting up Gmail OAuth...")
-    email_automation = EmailAutomation()
-    if email_automation.service:
-        print("✅ Gmail OAuth setup successful!")
-        print("A token.pickle file has been created for future use.")
-    else:
-        print("❌ Gmail OAuth setup failed. Please check your credentials.")
-
-
-if __name__ == "__main__":
-    # Run setup when this file is executed directly
+#!/usr/bin/env python3
+"""
+Email automation module for sending attendance notifications to late and absent employees.
+"""
+
+import os
+import atexit
+import base64
+import collections
+import concurrent.futures
+import logging
+import logging.handlers
+import queue
+import random
+import string
+import sys
+import threading
+import time
+import httplib2
+import google_auth_httplib2
+from email.header import Header
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from google_auth_oauthlib.flow import InstalledAppFlow
+from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+import datetime
+from config import (
+    EMAIL_AUTOMATION_ENABLED,
+    EMAIL_SENDER,
+    HR_EMAIL,
+    GMAIL_OAUTH_CREDENTIALS,
+    EMAIL_TEMPLATES
+)
+
+# Gmail API scope for sending emails
+SCOPES = ['https://www.googleapis.com/auth/gmail.send']
+
+
+class _Template:
+    """An email body template pre-parsed at construction.
+
+    str.format re-parses the format string on every call; here the
+    literal/field segments are split out once and rendering is a join,
+    which scales with the recipient count."""
+
+    __slots__ = ('_parts',)
+
+    def __init__(self, text):
+        self._parts = [(literal, field, spec)
+                       for literal, field, spec, _ in string.Formatter().parse(text)]
+
+    def render(self, vars):
+        out = []
+        for literal, field, spec in self._parts:
+            out.append(literal)
+            if field is not None:
+                out.append(format(vars[field], spec))
+        return ''.join(out)
+
+# Authenticated (service, creds) shared across EmailAutomation instances so
+# re-instantiation doesn't reload the token or rebuild the discovery client.
+_SERVICE_CACHE = None
+
+# Serializes token refresh: concurrent callers racing creds.refresh() each
+# pay a network round trip and can invalidate each other's tokens.
+_refresh_lock = threading.Lock()
+
+# Per-send messages go through a queue so batch workers only enqueue a record
+# instead of serializing on stdout's lock; one listener thread does the
+# formatting and flushing.
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _log_queue = queue.Queue(-1)
+    _stream_handler = logging.StreamHandler(sys.stdout)
+    _stream_handler.setFormatter(logging.Formatter('%(message)s'))
+    _log_listener = logging.handlers.QueueListener(_log_queue, _stream_handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+    logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+class EmailAutomation:
+    """Handles automated email notifications for attendance."""
+    
+    def __init__(self):
+        self.service = None
+        self.creds = None
+        self.sender_email = EMAIL_SENDER
+        self.hr_email = HR_EMAIL
+
+        # Sliding-window send throttle (see _wait_for_quota)
+        self._send_times = collections.deque()
+        self._throttle_lock = threading.Lock()
+
+        # Pre-parse the template bodies once; the send loop only renders.
+        self._late_subject = EMAIL_TEMPLATES['late']['subject']
+        self._late_body = _Template(EMAIL_TEMPLATES['late']['body'])
+        self._absent_subject = EMAIL_TEMPLATES['absent']['subject']
+        self._absent_body = _Template(EMAIL_TEMPLATES['absent']['body'])
+
+
+        if EMAIL_AUTOMATION_ENABLED:
+            self._authenticate()
+    
+    def _authenticate(self):
+        """Authenticate with Gmail API using OAuth2."""
+        global _SERVICE_CACHE
+
+        if _SERVICE_CACHE is not None:
+            self.service, self.creds = _SERVICE_CACHE
+            return
+
+        creds = None
+        token_file = 'token.json'
+
+        # Token file stores the user's access and refresh tokens
+        if os.path.exists(token_file):
+            creds = Credentials.from_authorized_user_file(token_file, SCOPES)
+
+        # Only hit the OAuth endpoint when the token is genuinely near expiry
+        # (5-minute skew); refreshing an unexpired token wastes a round trip.
+        fresh = bool(
+            creds and creds.expiry
+            and creds.expiry - datetime.datetime.utcnow() > datetime.timedelta(minutes=5)
+        )
+        if not fresh:
+            with _refresh_lock:
+                # Double-checked: another thread may have finished the whole
+                # authentication while this one waited on the lock.
+                if _SERVICE_CACHE is not None:
+                    self.service, self.creds = _SERVICE_CACHE
+                    return
+                # Re-read the token file too — a thread that just refreshed
+                # rewrites it, and reusing that token avoids a second refresh
+                # round trip (or a second interactive OAuth flow).
+                if os.path.exists(token_file):
+                    creds = Credentials.from_authorized_user_file(token_file, SCOPES)
+                if creds and creds.expired and creds.refresh_token:
+                    if not creds.valid:
+                        creds.refresh(Request())
+                elif not creds or not creds.valid:
+                    # Create credentials from the config
+                    flow = InstalledAppFlow.from_client_config(
+                        GMAIL_OAUTH_CREDENTIALS, SCOPES)
+                    creds = flow.run_local_server(port=0)
+
+                # Save the credentials for the next run
+                with open(token_file, 'w') as token:
+                    token.write(creds.to_json())
+
+        try:
+            self.creds = creds
+            # One keep-alive transport for the service: httplib2 holds a
+            # persistent HTTPS connection per host, so sequential sends reuse
+            # the same TLS session instead of re-handshaking per message.
+            authed_http = google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http())
+            # static_discovery uses the Gmail discovery doc bundled with the
+            # client library instead of downloading ~200KB on every cold start.
+            self.service = build('gmail', 'v1', http=authed_http,
+                                 static_discovery=True)
+            _SERVICE_CACHE = (self.service, creds)
+            print("Email automation: Successfully authenticated with Gmail API")
+        except Exception as e:
+            print(f"Email automation: Failed to authenticate - {e}")
+            self.service = None
+    
+    def _create_message(self, to, subject, body):
+        """Create an email message.
+
+        The notifications are plain-text and single-part, so the RFC 5322
+        bytes are assembled directly instead of going through the
+        MIMEMultipart/email.generator machinery."""
+        if not subject.isascii():
+            subject = Header(subject, 'utf-8').encode()
+
+        raw = (
+            f"To: {to}\r\n"
+            f"From: {self.sender_email}\r\n"
+            f"Subject: {subject}\r\n"
+            f"MIME-Version: 1.0\r\n"
+            f"Content-Type: text/plain; charset=utf-8\r\n"
+            f"\r\n"
+            f"{body}"
+        ).encode('utf-8')
+        return {'raw': base64.urlsafe_b64encode(raw).decode('ascii')}
+    
+    # Gmail allows 250 quota units/sec per user and messages.send costs 100,
+    # so roughly 2 sends per second (150 per minute) sustained.
+    QUOTA_UNITS_PER_SECOND = 250
+    SEND_COST = 100
+
+    # Transient statuses worth retrying; anything else fails immediately
+    RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+
+    def _wait_for_quota(self):
+        """Block until one more send fits in the sliding per-minute quota window.
+
+        Proactive throttling is cheaper than reacting to 429s, since rejected
+        requests still burn quota. Thread-safe for the concurrent batch path."""
+        window = 60.0
+        max_sends = (self.QUOTA_UNITS_PER_SECOND * 60) // self.SEND_COST
+        with self._throttle_lock:
+            now = time.time()
+            while self._send_times and now - self._send_times[0] >= window:
+                self._send_times.popleft()
+            sleep_for = 0.0
+            if len(self._send_times) >= max_sends:
+                sleep_for = self._send_times[0] + window - now
+            self._send_times.append(now + sleep_for)
+        if sleep_for > 0:
+            logger.info(f"  ⏳ Gmail quota window full; waiting {sleep_for:.1f}s before next send")
+            time.sleep(sleep_for)
+
+    def _execute_with_retry(self, request, max_attempts=5):
+        """Execute a Gmail API request, retrying 429/5xx with backoff + jitter."""
+        for attempt in range(1, max_attempts + 1):
+            try:
+                return request.execute()
+            except HttpError as error:
+                status = error.resp.status if error.resp is not None else None
+                if status not in self.RETRYABLE_STATUS or attempt == max_attempts:
+                    raise
+                delay = min(2 ** attempt + random.random(), 32)
+                retry_after = error.resp.get('retry-after')
+                if retry_after:
+                    try:
+                        delay = int(retry_after)
+                    except ValueError:
+                        # Retry-After may also be an HTTP-date; keep the
+                        # exponential delay rather than parsing it.
+                        pass
+                logger.info(f"  ⚠️ Gmail returned {status}; retrying in {delay:.1f}s "
+                            f"(attempt {attempt}/{max_attempts})")
+                time.sleep(delay)
+
+    def _send_message(self, message):
+        """Send an email message."""
+        if not self.service:
+            print("Email automation: Service not initialized, skipping email")
+            return False
+
+        self._wait_for_quota()
+        try:
+            result = self._execute_with_retry(
+                self.service.users().messages().send(userId='me', body=message))
+            logger.info(f"Email sent successfully: {result['id']}")
+            return True
+        except HttpError as error:
+            logger.error(f'An error occurred while sending email: {error}')
+            return False
+    
+    def _build_late_message(self, employee_data, date, start_time):
+        """Build the late-notification message for one employee."""
+        template_vars = {
+            'name': employee_data['name'],
+            'date': date.strftime('%Y-%m-%d'),
+            'check_in_time': employee_data['arrival_time'],
+            'expected_time': start_time.strftime('%I:%M %p'),
+            'minutes_late': employee_data['minutes_late'],
+            'hr_email': self.hr_email
+        }
+
+        return self._create_message(
+            to=employee_data['email'],
+            subject=self._late_subject,
+            body=self._late_body.render(template_vars)
+        )
+
+    def _build_absent_message(self, employee_data, date):
+        """Build the absent-notification message for one employee."""
+        template_vars = {
+            'name': employee_data['name'],
+            'date': date.strftime('%Y-%m-%d'),
+            'hr_email': self.hr_email
+        }
+
+        return self._create_message(
+            to=employee_data['email'],
+            subject=self._absent_subject,
+            body=self._absent_body.render(template_vars)
+        )
+
+    def send_late_notification(self, employee_data, date, start_time):
+        """Send notification to a late employee."""
+        if not EMAIL_AUTOMATION_ENABLED:
+            return
+
+        message = self._build_late_message(employee_data, date, start_time)
+        success = self._send_message(message)
+        if success:
+            logger.info(f"  📧 Sent late notification to {employee_data['name']} ({employee_data['email']})")
+        else:
+            logger.error(f"  ❌ Failed to send late notification to {employee_data['name']} ({employee_data['email']})")
+        
+        return success
+    
+    def send_absent_notification(self, employee_data, date):
+        """Send notification to an absent employee."""
+        if not EMAIL_AUTOMATION_ENABLED:
+            return
+
+        message = self._build_absent_message(employee_data, date)
+        success = self._send_message(message)
+        if success:
+            logger.info(f"  📧 Sent absent notification to {employee_data['name']} ({employee_data['email']})")
+        else:
+            logger.error(f"  ❌ Failed to send absent notification to {employee_data['name']} ({employee_data['email']})")
+        
+        return success
+    
+    # Gmail's batch endpoint accepts at most 100 calls per HTTP request
+    BATCH_SIZE = 100
+    # Keep the in-flight batch count modest to stay inside Gmail send quotas
+    MAX_CONCURRENT_BATCHES = 4
+
+    def send_batch_notifications(self, attendance_data, date, department_start_times):
+        """Send batch notifications for all late and absent employees."""
+        if not EMAIL_AUTOMATION_ENABLED:
+            print("Email automation is disabled")
+            return
+
+        if not self.service:
+            print("Email automation: Service not initialized, skipping emails")
+            return
+
+        print("\n--- Starting Email Notifications ---")
+
+        # Build every message up front, then submit them through the Gmail
+        # batch endpoint so N emails cost ceil(N/100) HTTPS round trips
+        # instead of N.
+        # Flatten every department bucket into one (kind, employee, dept)
+        # stream so the build/dedup/chunking below is a single pass.
+        tasks = [(kind, employee, department)
+                 for department, data in attendance_data.items()
+                 for kind in ('late', 'absent')
+                 for employee in data.get(kind, ())]
+
+        outgoing = []  # (recipient email, message body)
+        late_count = 0
+        absent_count = 0
+        # An employee can surface in more than one department bucket (or a
+        # re-run can replay the same lists); one email per (person, kind, day).
+        seen = set()
+        date_key = date.isoformat()
+
+        for kind, employee, department in tasks:
+            key = (employee['email'], kind, date_key)
+            if key in seen:
+                continue
+            seen.add(key)
+            if kind == 'late':
+                message = self._build_late_message(
+                    employee, date, department_start_times.get(department))
+                late_count += 1
+            else:
+                message = self._build_absent_message(employee, date)
+                absent_count += 1
+            outgoing.append((kind, employee['email'], message))
+
+        sent = 0
+        failed = 0
+        counter_lock = threading.Lock()
+
+        def _on_send(request_id, response, exception):
+            nonlocal sent, failed
+            # request_id is "<kind>:<recipient>"; strip the kind prefix back
+            # off for the log line.
+            recipient = request_id.split(':', 1)[1]
+            if exception is not None:
+                with counter_lock:
+                    failed += 1
+                logger.error(f"  ❌ Failed to send notification to {recipient}: {exception}")
+            else:
+                with counter_lock:
+                    sent += 1
+                logger.info(f"  📧 Sent notification to {recipient}")
+
+        def _send_chunk(chunk):
+            batch = self.service.new_batch_http_request(callback=_on_send)
+            for kind, recipient, message in chunk:
+                # Each batched message still counts against the send quota
+                self._wait_for_quota()
+                # Ids must be unique within a batch; one recipient can get
+                # both a late and an absent notification on the same day.
+                batch.add(
+                    self.service.users().messages().send(userId='me', body=message),
+                    request_id=f"{kind}:{recipient}"
+                )
+            # httplib2.Http is not thread-safe, so each worker executes its
+            # batch over its own authorized transport.
+            batch.execute(http=google_auth_httplib2.AuthorizedHttp(self.creds, http=httplib2.Http()))
+
+        chunks = [outgoing[i:i + self.BATCH_SIZE] for i in range(0, len(outgoing), self.BATCH_SIZE)]
+
+        if len(chunks) <= 1:
+            for chunk in chunks:
+                try:
+                    _send_chunk(chunk)
+                except HttpError as error:
+                    logger.error(f'An error occurred while sending email batch: {error}')
+        else:
+            # Overlap the per-chunk HTTPS round trips with a bounded pool;
+            # one failing chunk must not cancel its siblings.
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.MAX_CONCURRENT_BATCHES) as pool:
+                futures = [pool.submit(_send_chunk, chunk) for chunk in chunks]
+                for future in concurrent.futures.as_completed(futures):
+                    try:
+                        future.result()
+                    except HttpError as error:
+                        logger.error(f'An error occurred while sending email batch: {error}')
+
+        logger.info(f"\n📧 Email Summary: {sent} sent, {failed} failed "
+                    f"({late_count} late, {absent_count} absent notifications)")
+        logger.info("--- Email Notifications Complete ---\n")
+
+
+# Utility function for one-time setup
+def setup_gmail_oauth():
+    """Run this to set up Gmail OAuth for the first time."""
+    print("Setting up Gmail OAuth...")
+    email_automation = EmailAutomation()
+    if email_automation.service:
+        print("✅ Gmail OAuth setup successful!")
+        print("A token.json file has been created for future use.")
+    else:
+        print("❌ Gmail OAuth setup failed. Please check your credentials.")
+
+
+if __name__ == "__main__":
+    # Run setup when this file is executed directly
     setup_gmail_oauth() 
\ No newline at end of file
@@ -1,4 +1,7 @@
+import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import base64
 import os
 import sys
@@ -8,53 +11,189 @@ from config import (
     WEBWORK_API_USER
 )
 
+try:
+    import ijson  # Optional: stream-parse the directory instead of loading it whole
+except ImportError:
+    ijson = None
+
+try:
+    import ahocorasick  # Optional: single-pass multi-pattern matching
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson  # Optional: faster whole-payload decode when not streaming
+except ImportError:
+    orjson = None
+
+
+def build_name_matcher(names_lower):
+    """Return a callable mapping lowercase text -> set of matched names.
+
+    Uses an Aho–Corasick automaton when pyahocorasick is installed (one linear
+    scan regardless of pattern count); otherwise a C-level substring check per
+    name. A regex alternation is not equivalent here: it reports only one
+    match per position, so a name that is a substring of another ("john" in
+    "johnson") would be dropped."""
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for name in names_lower:
+            automaton.add_word(name, name)
+        automaton.make_automaton()
+        return lambda text: {name for _, name in automaton.iter(text)}
+
+    names_lower = tuple(names_lower)
+    return lambda text: {name for name in names_lower if name in text}
+
+
+# The directory response is persisted here together with its ETag so that
+# unchanged directories cost a single conditional request (304) per run.
+_CACHE_PATH = os.path.expanduser('~/.cache/webwork_users.json')
+_ETAG_PATH = _CACHE_PATH + '.etag'
+
+
+def _read_cached_etag():
+    """Return the ETag of the cached directory body, or None."""
+    if os.path.exists(_CACHE_PATH) and os.path.exists(_ETAG_PATH):
+        with open(_ETAG_PATH) as fh:
+            return fh.read().strip() or None
+    return None
+
+
+def iter_webwork_users(path=_CACHE_PATH):
+    """Yield directory entries one at a time from the on-disk cache copy.
+
+    With ijson installed the top-level array is parsed incrementally, so peak
+    memory stays flat regardless of directory size; otherwise the whole file
+    is decoded in one go."""
+    with open(path, 'rb') as fh:
+        head = fh.read(3)
+        if head != b'\xef\xbb\xbf':  # Handle UTF-8 BOM if present
+            fh.seek(0)
+        if ijson is not None:
+            yield from ijson.items(fh, 'item')
+        elif orjson is not None:
+            yield from orjson.loads(fh.read())
+        else:
+            yield from json.loads(fh.read().decode('utf-8'))
+
+
+# The credentials are static config, so the Basic header is computed once.
+_AUTH_HEADER = {
+    "Authorization": "Basic " + base64.b64encode(
+        f"{WEBWORK_API_USER}:{WEBWORK_API_KEY}".encode()).decode()
+}
+
+
 def get_auth_header():
     """Get Basic Authentication header for WebWork API."""
-    credentials = f"{WEBWORK_API_USER}:{WEBWORK_API_KEY}"
-    encoded_credentials = base64.b64encode(credentials.encode()).decode()
-    return {"Authorization": f"Basic {encoded_credentials}"}
+    return _AUTH_HEADER
 
-def find_users_in_webwork(names_to_find):
+# Shared session: retries transient failures with backoff and keeps the TLS
+# connection alive if the search is driven repeatedly from another module.
+_session = requests.Session()
+_session.headers.update(get_auth_header())
+_session.mount("https://", HTTPAdapter(max_retries=Retry(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    respect_retry_after_header=True,
+)))
+
+
+def fetch_user_directory():
+    """Fetch the user directory into the on-disk cache and return its path.
+
+    Sends If-None-Match with the cached ETag; on 304 the previous body is
+    reused, skipping both the download and any re-parse of an unchanged
+    directory."""
+    headers = {}
+    etag = _read_cached_etag()
+    if etag:
+        headers['If-None-Match'] = etag
+
+    response = _session.get(WEBWORK_USERS_API_URL, stream=True, timeout=(5, 30),
+                            headers=headers)
+    if response.status_code == 304:
+        print("User directory unchanged since last run; using cached copy.")
+        return _CACHE_PATH
+    response.raise_for_status()
+
+    os.makedirs(os.path.dirname(_CACHE_PATH), exist_ok=True)
+    # Stream into a sidecar and rename once complete, mirroring the other
+    # on-disk caches; a connection drop mid-download must not leave a torn
+    # body behind an ETag that still answers 304.
+    tmp_path = _CACHE_PATH + '.tmp'
+    with open(tmp_path, 'wb') as fh:
+        for chunk in response.iter_content(chunk_size=65536):
+            fh.write(chunk)
+    os.replace(tmp_path, _CACHE_PATH)
+
+    new_etag = response.headers.get('ETag')
+    if new_etag:
+        with open(_ETAG_PATH, 'w') as fh:
+            fh.write(new_etag)
+    elif os.path.exists(_ETAG_PATH):
+        os.remove(_ETAG_PATH)
+    return _CACHE_PATH
+
+
+def load_directory():
+    """Fetch the directory once as a list of (lowercase fullname, user).
+
+    The lowercasing happens here so that any number of searches against the
+    same directory reuse one pre-folded string per user instead of calling
+    .lower() again per query.
     """
-    Connects to WebWork, fetches all users, and searches for specific names.
+    print("Connecting to WebWork to fetch user directory...")
+    cache_path = fetch_user_directory()
+    return [(name.lower(), user)
+            for user in iter_webwork_users(cache_path)
+            if (name := user.get('fullname'))]
+
+
+def search(directory, names_to_find):
+    """Search a pre-loaded directory for specific names and print matches.
 
     Args:
+        directory (list): (lowercase fullname, user) pairs from load_directory().
         names_to_find (list): A list of names to search for.
     """
-    print("Connecting to WebWork to fetch user directory...")
-    try:
-        response = requests.get(WEBWORK_USERS_API_URL, headers=get_auth_header())
-        response.raise_for_status()
-        # Handle UTF-8 BOM if present
-        response.encoding = 'utf-8-sig'
-        all_users = response.json()
-        print(f"Successfully downloaded directory with {len(all_users)} users.")
-    except requests.exceptions.RequestException as e:
-        print(f"Error: Could not fetch user directory from WebWork. {e}", file=sys.stderr)
-        return
-
     print("\n--- Search Results ---")
     names_to_find_lower = [name.lower() for name in names_to_find]
+    match_names = build_name_matcher(names_to_find_lower)
     found_count = 0
 
-    for user in all_users:
-        user_fullname = user.get('fullname', '').lower()
-        user_email = user.get('email', 'N/A')
-        user_id = user.get('id', 'N/A')
-        
-        for name_to_find_lower in names_to_find_lower:
-            # Flexible search: check if the name is contained in the full name
-            if name_to_find_lower in user_fullname:
-                print(f"\nMatch Found for '{name_to_find_lower.title()}'")
-                print(f"  - WebWork Full Name: {user.get('fullname', 'N/A')}")
-                print(f"  - Email (ID):        {user_email}")
-                print(f"  - WebWork User ID:   {user_id}")
-                found_count += 1
+    for user_fullname, user in directory:
+        # Flexible search: check if any target name is contained in the full name
+        for matched_name in match_names(user_fullname):
+            print(f"\nMatch Found for '{matched_name.title()}'")
+            print(f"  - WebWork Full Name: {user.get('fullname', 'N/A')}")
+            print(f"  - Email (ID):        {user.get('email', 'N/A')}")
+            print(f"  - WebWork User ID:   {user.get('id', 'N/A')}")
+            found_count += 1
 
+    print(f"\nScanned directory of {len(directory)} users.")
     if found_count == 0:
-        print("\nNo matches found for the specified names in the WebWork user directory.")
+        print("No matches found for the specified names in the WebWork user directory.")
     else:
-        print(f"\nFound {found_count} potential match(es).")
+        print(f"Found {found_count} potential match(es).")
+
+
+def find_users_in_webwork(names_to_find):
+    """
+    Connects to WebWork, fetches all users, and searches for specific names.
+
+    Args:
+        names_to_find (list): A list of names to search for.
+    """
+    try:
+        directory = load_directory()
+    except requests.exceptions.RequestException as e:
+        print(f"Error: Could not fetch user directory from WebWork. {e}", file=sys.stderr)
+        return
+
+    search(directory, names_to_find)
 
 def main():
     """Main function to run the user search."""
@@ -1,5 +1,9 @@
+import argparse
+import concurrent.futures
 import datetime
-import pytz
+import functools
+import io
+from zoneinfo import ZoneInfo
 import gspread
 from google.oauth2.service_account import Credentials
 import requests
@@ -21,6 +25,7 @@ from config import (
     SLACK_CHANNEL_ID,
     EMAIL_AUTOMATION_ENABLED
 )
+import threading
 import time
 import gspread.utils
 from slack_sdk import WebClient
@@ -28,14 +33,102 @@ from slack_sdk.errors import SlackApiError
 from email_automation import EmailAutomation
 import json
 
+# Loaded once per process; tz construction does IANA file lookups.
+_TZ = ZoneInfo(TIMEZONE)
+
+# Inverted once at import: project name -> departments it belongs to. Turns
+# the per-project department scan into a single dict lookup.
+_PROJECT_TO_DEPTS = {}
+for _dept, _projects in DEPARTMENTS_CONFIG.items():
+    for _project in _projects:
+        _PROJECT_TO_DEPTS.setdefault(_project, []).append(_dept)
+
+
+class _SheetSnap:
+    """A fetched sheet grid plus lookup indices built once.
+
+    header_index maps column title -> index and email_index maps normalized
+    email -> row index, so per-department processing does dict lookups
+    instead of re-scanning the header and rows."""
+
+    __slots__ = ("rows", "header_index", "email_index")
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.header_index = {h: i for i, h in enumerate(rows[0])} if rows else {}
+        self.email_index = {
+            row[1].lower().strip(): i
+            for i, row in enumerate(rows[1:], 1)
+            if len(row) > 1 and row[1]
+        }
+
+
+@functools.lru_cache(maxsize=1)
+def _load_credentials():
+    """Load the service-account credentials once per process; repeat
+    constructions reuse the parsed object instead of re-reading the file."""
+    scopes = ["https://www.googleapis.com/auth/spreadsheets"]
+    # Handle UTF-8 BOM in the service account file
+    with open(GOOGLE_SERVICE_ACCOUNT_FILE, 'r', encoding='utf-8-sig') as f:
+        service_account_info = json.load(f)
+    return Credentials.from_service_account_info(service_account_info, scopes=scopes)
+
+
+@functools.lru_cache(maxsize=1024)
+def _col_to_a1(col):
+    """Converts a 1-based column number to A1 notation (e.g., 1 -> A, 27 -> AA).
+
+    Pure and called once per changed cell in the diff writer, so repeat
+    conversions come straight from the cache."""
+    if col < 1:
+        raise ValueError("Column number must be 1 or greater.")
+
+    letters = []
+    while col > 0:
+        col, remainder = divmod(col - 1, 26)
+        letters.append(chr(65 + remainder))
+    return ''.join(reversed(letters))
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_hm(hhmm):
+    """Parse an 'HH:MM' start-time string into a time (memoized: the same
+    handful of configured strings are parsed over and over per run)."""
+    return datetime.datetime.strptime(hhmm, "%H:%M").time()
+
 class SlackNotifier:
     """Handles formatting and sending Slack messages."""
+
+    # Slack rejects messages beyond ~40k characters; split before that.
+    MAX_MESSAGE_CHARS = 40000
+
     def __init__(self):
         if not SLACK_BOT_TOKEN or not SLACK_CHANNEL_ID:
             print("Warning: Slack credentials not found. Slack notifications will be disabled.")
             self.client = None
         else:
             self.client = WebClient(token=SLACK_BOT_TOKEN)
+        # All posts go through _post so messages arrive in order and respect
+        # Slack's one-message-per-second-per-channel rate limit.
+        self._post_lock = threading.Lock()
+        self._last_post = 0.0
+
+    def _post(self, text):
+        """Send one message to the report channel, serialized and >=1s apart."""
+        if not self.client:
+            return False
+        with self._post_lock:
+            wait = self._last_post + 1.0 - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                self.client.chat_postMessage(channel=SLACK_CHANNEL_ID, text=text)
+                return True
+            except SlackApiError as e:
+                print(f"  Error sending Slack message: {e.response['error']}", file=sys.stderr)
+                return False
+            finally:
+                self._last_post = time.monotonic()
 
     def _build_ascii_table(self, headers, rows):
         """Builds a formatted ASCII table inside a code block."""
@@ -82,19 +175,25 @@ class SlackNotifier:
                         normalized_row.append("")  # Empty cell for missing data
                 normalized_rows.append(normalized_row)
             
-            # Calculate column widths
-            col_widths = [len(h) for h in headers]
+            # Column widths in one pass; cells are already strings here.
+            col_widths = [max(len(h), max(map(len, col)))
+                          for h, col in zip(headers, zip(*normalized_rows))]
+
+            # One format spec per table, applied row-wise in C, instead of a
+            # Python-level ljust per cell. Rows stream into one buffer so
+            # large tables avoid the intermediate line list + concatenation.
+            fmt = " | ".join(f"{{:<{w}}}" for w in col_widths)
+
+            buf = io.StringIO()
+            buf.write("```\n")
+            buf.write(fmt.format(*headers))
+            buf.write("\n")
+            buf.write("-|-".join("-" * w for w in col_widths))
             for row in normalized_rows:
-                for i, cell in enumerate(row):
-                    if i < len(col_widths):
-                        col_widths[i] = max(col_widths[i], len(str(cell)))
-
-            # Build table
-            header_line = " | ".join(h.ljust(col_widths[i]) for i, h in enumerate(headers))
-            separator_line = "-|-".join("-" * col_widths[i] for i in range(len(headers)))
-            body_lines = [" | ".join(str(cell).ljust(col_widths[i]) for i, cell in enumerate(row)) for row in normalized_rows]
-            
-            return "```\n" + "\n".join([header_line, separator_line] + body_lines) + "\n```"
+                buf.write("\n")
+                buf.write(fmt.format(*row))
+            buf.write("\n```")
+            return buf.getvalue()
         
         except Exception as e:
             print(f"  Error building table: {e}")
@@ -107,45 +206,65 @@ class SlackNotifier:
             print("  No data to send to Slack.")
             return
 
-        message_parts = [report_title]
-
+        # Build one section per department so an oversized report can be
+        # split on department boundaries instead of mid-table.
+        sections = []
         for dept, data in aggregated_data.items():
             try:
-                message_parts.append(f"\n\n--- *{dept}* ---")
-                
+                section_parts = [f"\n\n--- *{dept}* ---"]
+
                 if run_type == 'morning':
-                    message_parts.append("\n*On-time Arrivals*")
-                    message_parts.append(self._build_ascii_table(["Name", "Email", "Time"], data['present']))
-                    message_parts.append("\n*Late Arrivals (5-30 min)*")
-                    message_parts.append(self._build_ascii_table(["Name", "Email", "Time", "Min Late"], data['late']))
+                    section_parts.append("\n*On-time Arrivals*")
+                    section_parts.append(self._build_ascii_table(["Name", "Email", "Time"], data['present']))
+                    section_parts.append("\n*Late Arrivals (5-30 min)*")
+                    section_parts.append(self._build_ascii_table(["Name", "Email", "Time", "Min Late"], data['late']))
                 elif run_type == 'eod':
-                    message_parts.append("\n*On-time Arrivals*")
-                    message_parts.append(self._build_ascii_table(["Name", "Email", "Time"], data['present']))
-                    message_parts.append("\n*Late Arrivals (5-30 min)*")
-                    message_parts.append(self._build_ascii_table(["Name", "Email", "Time", "Min Late"], data['late']))
-                    message_parts.append("\n*Absent*")
-                    message_parts.append(self._build_ascii_table(["Name", "Email"], data['absent']))
+                    section_parts.append("\n*On-time Arrivals*")
+                    section_parts.append(self._build_ascii_table(["Name", "Email", "Time"], data['present']))
+                    section_parts.append("\n*Late Arrivals (5-30 min)*")
+                    section_parts.append(self._build_ascii_table(["Name", "Email", "Time", "Min Late"], data['late']))
+                    section_parts.append("\n*Absent*")
+                    section_parts.append(self._build_ascii_table(["Name", "Email"], data['absent']))
+                sections.append("\n".join(section_parts))
             except Exception as e:
                 print(f"  Error building table for {dept}: {e}")
                 # Add a simple fallback message
-                message_parts.append(f"\n*Error building report for {dept}: {str(e)}*")
+                sections.append(f"\n*Error building report for {dept}: {str(e)}*")
+
+        # Pack sections into as few ordered posts as the size limit allows.
+        messages = []
+        current = report_title
+        for section in sections:
+            if len(current) + len(section) + 1 > self.MAX_MESSAGE_CHARS:
+                messages.append(current)
+                current = section.lstrip("\n")
+            else:
+                current = current + "\n" + section
+        messages.append(current)
 
-        final_message = "\n".join(message_parts)
-        
-        try:
-            self.client.chat_postMessage(channel=SLACK_CHANNEL_ID, text=final_message)
+        if all(self._post(message) for message in messages):
             print(f"  Successfully sent consolidated Slack report.")
-        except SlackApiError as e:
-            print(f"  Error sending consolidated Slack report: {e.response['error']}", file=sys.stderr)
 
 
 class AttendanceReportGenerator:
     def __init__(self):
-        self.tz = pytz.timezone(TIMEZONE)
+        # zoneinfo is both faster than pytz and correct when passed as
+        # tzinfo= (pytz needs .localize() to avoid LMT offsets).
+        self.tz = _TZ
         self.gc = self._authenticate_google_sheets()
         self.spreadsheet = self.gc.open_by_key(GOOGLE_SHEET_ID)
         self.user_cache = {}
         self.attendance_options = ["Present", "Late", "Absent"]
+
+        # Credentials are static, so encode the Basic header once; the
+        # session carries it as a default and keeps the TLS connection
+        # alive across the two WebWork endpoints.
+        self._auth_header = {
+            "Authorization": "Basic " + base64.b64encode(
+                f"{WEBWORK_API_USER}:{WEBWORK_API_KEY}".encode()).decode()
+        }
+        self._http = requests.Session()
+        self._http.headers.update(self._auth_header)
         
         # Color definitions for formatting
         self.header_color = {"red": 0.26, "green": 0.44, "blue": 0.76}  # Blue
@@ -153,6 +272,16 @@ class AttendanceReportGenerator:
         self.late_color = {"red": 1.0, "green": 0.94, "blue": 0.60}     # Yellow
         self.absent_color = {"red": 1.0, "green": 0.77, "blue": 0.80}     # Red
         self.slack_notifier = SlackNotifier()
+        # Populated by _prefetch_sheets so per-department processing doesn't
+        # re-fetch worksheet metadata.
+        self._worksheets_by_title = None
+        # Pool for network side effects (Slack posts) that can overlap the
+        # rest of the run; _post keeps the messages themselves ordered.
+        self._io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+        # (sheet_id, col_count) pairs whose conditional-formatting rules the
+        # API has accepted this run; re-runs against an unchanged header
+        # skip the redundant addConditionalFormatRule requests.
+        self._cf_applied = set()
         
         # Initialize email automation
         self.email_automation = EmailAutomation() if EMAIL_AUTOMATION_ENABLED else None
@@ -162,30 +291,22 @@ class AttendanceReportGenerator:
 
     def _authenticate_google_sheets(self):
         """Authenticate with Google Sheets using service account."""
-        scopes = ["https://www.googleapis.com/auth/spreadsheets"]
         try:
-            # Handle UTF-8 BOM in the service account file
-            with open(GOOGLE_SERVICE_ACCOUNT_FILE, 'r', encoding='utf-8-sig') as f:
-                service_account_info = json.load(f)
-            creds = Credentials.from_service_account_info(service_account_info, scopes=scopes)
-            return gspread.authorize(creds)
+            return gspread.authorize(_load_credentials())
         except Exception as e:
             print(f"Error authenticating with Google Sheets: {e}")
             return None
 
     def get_auth_header(self):
         """Get Basic Authentication header for WebWork API."""
-        credentials = f"{WEBWORK_API_USER}:{WEBWORK_API_KEY}"
-        encoded_credentials = base64.b64encode(credentials.encode()).decode()
-        return {"Authorization": f"Basic {encoded_credentials}"}
+        return self._auth_header
 
     def fetch_webwork_data(self, date):
         """Fetch attendance data from WebWork API."""
         try:
-            response = requests.get(
+            response = self._http.get(
                 WEBWORK_API_URL,
                 params={"start_date": date, "end_date": date},
-                headers=self.get_auth_header(),
             )
             response.raise_for_status()
             # Handle UTF-8 BOM if present
@@ -195,10 +316,27 @@ class AttendanceReportGenerator:
             print(f"Error fetching WebWork data: {e}", file=sys.stderr)
             return None
 
+    # The user directory changes at most daily; reuse the on-disk copy for
+    # that long before paying the download again.
+    USER_CACHE_FILE = ".user_cache.json"
+    USER_CACHE_TTL = 86400
+    SHEET_META_CACHE_FILE = ".sheet_meta_cache.json"
+    SHEET_META_CACHE_TTL = 3600
+
     def fetch_user_info(self):
         """Fetch user information from WebWork API and populate cache."""
         try:
-            response = requests.get(WEBWORK_USERS_API_URL, headers=self.get_auth_header())
+            if (os.path.exists(self.USER_CACHE_FILE)
+                    and time.time() - os.path.getmtime(self.USER_CACHE_FILE) < self.USER_CACHE_TTL):
+                with open(self.USER_CACHE_FILE, encoding='utf-8') as f:
+                    self.user_cache = json.load(f)
+                print(f"Loaded cached info for {len(self.user_cache)} users.")
+                return
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable user cache: {e}")
+
+        try:
+            response = self._http.get(WEBWORK_USERS_API_URL)
             response.raise_for_status()
             # Handle UTF-8 BOM if present
             response.encoding = 'utf-8-sig'
@@ -207,6 +345,12 @@ class AttendanceReportGenerator:
                 if 'email' in user:
                     self.user_cache[user['email']] = user.get('fullname', user['email'])
             print(f"Successfully cached info for {len(self.user_cache)} users.")
+
+            # Atomic write so a crash mid-dump can't leave a torn cache file
+            tmp_file = self.USER_CACHE_FILE + ".tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.user_cache, f)
+            os.replace(tmp_file, self.USER_CACHE_FILE)
         except requests.exceptions.RequestException as e:
             print(f"Error fetching user info: {e}", file=sys.stderr)
 
@@ -217,23 +361,28 @@ class AttendanceReportGenerator:
     def get_department_employees_from_webwork(self, webwork_data):
         """Build department rosters from WebWork data based on project mappings."""
         department_employees = {dept: [] for dept in DEPARTMENTS_CONFIG.keys()}
-        
+        seen = {dept: set() for dept in DEPARTMENTS_CONFIG.keys()}
+
         if not webwork_data or "dateReport" not in webwork_data:
             return department_employees
 
         for report in webwork_data["dateReport"]:
             email = report.get("email")
             name = self.get_user_name(email)
-            
+
             if not email:
                 continue
 
+            # Normalized once here; every downstream lookup uses emp['norm']
+            # instead of re-running lower().strip() per helper.
+            norm = email.lower().strip()
+
             for project in report.get("projects", []):
                 project_name = project.get("projectName")
-                for dept, proj_list in DEPARTMENTS_CONFIG.items():
-                    if project_name in proj_list:
-                        if not any(e['email'] == email for e in department_employees[dept]):
-                            department_employees[dept].append({"name": name, "email": email})
+                for dept in _PROJECT_TO_DEPTS.get(project_name, ()):
+                    if norm not in seen[dept]:
+                        seen[dept].add(norm)
+                        department_employees[dept].append({"name": name, "email": email, "norm": norm})
         
         return {dept: emps for dept, emps in department_employees.items() if emps}
 
@@ -251,57 +400,88 @@ class AttendanceReportGenerator:
             # Normalize email for consistent matching
             normalized_email = email.lower().strip()
             
-            first_entry_time = None
+            # Track the minimum as an (hour, minute) tuple; slicing a fixed
+            # "HH:MM" string is far cheaper than strptime, and the tz-aware
+            # datetime only needs to be built once per user, not per entry.
+            best_hm = None
             for project in report.get("projects", []):
                 for task in project.get("tasks", []):
                     for entry in task.get("timeEntries", []):
+                        s = entry.get("beginDatetime")
+                        if not isinstance(s, str) or len(s) < 5 or s[2] != ':':
+                            continue
                         try:
-                            begin_time = datetime.datetime.strptime(entry["beginDatetime"], "%H:%M").time()
-                            entry_datetime = datetime.datetime.combine(target_date, begin_time, tzinfo=self.tz)
-                            if first_entry_time is None or entry_datetime < first_entry_time:
-                                first_entry_time = entry_datetime
-                        except (ValueError, TypeError):
+                            hm = (int(s[0:2]), int(s[3:5]))
+                        except ValueError:
                             continue
-            if first_entry_time:
-                first_entries[normalized_email] = first_entry_time
+                        if best_hm is None or hm < best_hm:
+                            best_hm = hm
+            if best_hm is not None:
+                first_entries[normalized_email] = datetime.datetime.combine(
+                    target_date, datetime.time(best_hm[0], best_hm[1]), tzinfo=self.tz)
         return first_entries
 
     def _calculate_statuses(self, employees, first_entries, start_dt):
         """Calculates detailed statuses for a list of employees."""
+        # Fast path: if nobody in this department checked in, every branch
+        # lands in absent — skip the per-row datetime arithmetic entirely.
+        if not first_entries or not first_entries.keys() & {emp['norm'] for emp in employees}:
+            return [], [], [], [{'name': emp['name'], 'email': emp['email']} for emp in employees]
+
         present, late, initially_absent_late, absent = [], [], [], []
 
+        # Hot loop: bind the repeated lookups to locals and compare epoch
+        # seconds as integers, so each employee costs one dict probe and a
+        # little int arithmetic instead of method dispatch + timedelta math.
+        start_ts = start_dt.timestamp()
+        fe_get = first_entries.get
+        p_app, l_app, a_app = present.append, late.append, absent.append
+
         for emp in employees:
-            normalized_email = emp['email'].lower().strip()
-            if normalized_email in first_entries:
-                check_in = first_entries[normalized_email]
-                minutes_late = int((check_in - start_dt).total_seconds() / 60)
-                
-                emp_details = {
-                    'name': emp['name'], 
-                    'email': emp['email'],
-                    'arrival_time': check_in.strftime("%I:%M %p"),
-                    'minutes_late': minutes_late
-                }
-                
+            check_in = fe_get(emp['norm'])
+            if check_in is not None:
+                minutes_late = int(check_in.timestamp() - start_ts) // 60
+
                 if minutes_late <= 5:
-                    present.append(emp_details)
+                    p_app({
+                        'name': emp['name'],
+                        'email': emp['email'],
+                        'arrival_time': check_in.strftime("%I:%M %p"),
+                        'minutes_late': minutes_late
+                    })
                 elif minutes_late <= 30:
-                    late.append(emp_details)
+                    l_app({
+                        'name': emp['name'],
+                        'email': emp['email'],
+                        'arrival_time': check_in.strftime("%I:%M %p"),
+                        'minutes_late': minutes_late
+                    })
                 else:
                     # Anyone more than 30 minutes late is considered absent
-                    absent.append({
+                    a_app({
                         'name': emp['name'],
                         'email': emp['email']
                     })
             else:
                 # Ensure absent employees have the same structure as others
-                absent.append({
+                a_app({
                     'name': emp['name'],
                     'email': emp['email']
                 })
-        
+
         return present, late, initially_absent_late, absent
 
+    def _calculate_statuses_bulk(self, department_employees, first_entries, department_start_dts):
+        """Calculate statuses for several departments in one call.
+
+        Returns {department: (present, late, initially_absent, absent)}. Useful
+        for debug/test runs that sweep every department at once."""
+        results = {}
+        for department, employees in department_employees.items():
+            start_dt = department_start_dts[department]
+            results[department] = self._calculate_statuses(employees, first_entries, start_dt)
+        return results
+
     def run_consolidated_report(self, departments_to_process, date, run_type):
         """
         Processes a list of departments, updates their sheets, and sends one
@@ -309,40 +489,69 @@ class AttendanceReportGenerator:
         """
         print(f"--- Starting {run_type.upper()} consolidated run for {len(departments_to_process)} departments ---")
         
-        webwork_data = self.fetch_webwork_data(date.strftime('%Y-%m-%d'))
+        # The WebWork fetch and the Sheets prefetch are independent; run them
+        # concurrently so the run pays the slower of the two latencies
+        # instead of their sum.
+        webwork_future = self._io_pool.submit(self.fetch_webwork_data, date.strftime('%Y-%m-%d'))
+        sheets_future = self._io_pool.submit(self._prefetch_sheets, departments_to_process)
+
+        webwork_data = webwork_future.result()
         if not webwork_data:
             print("Aborting run due to WebWork API failure.")
             # Send a notification about the API failure
             error_title = f":warning: WebWork API Error - {run_type.title()} Report - {date.strftime('%Y-%m-%d')}"
             error_message = "Unable to fetch attendance data from WebWork API. Please check the API status and credentials."
-            try:
-                if self.slack_notifier.client:
-                    self.slack_notifier.client.chat_postMessage(channel=SLACK_CHANNEL_ID, text=error_message)
-                    print("  Sent API error notification to Slack.")
-            except Exception as e:
-                print(f"  Could not send error notification: {e}")
+            if self.slack_notifier._post(f"{error_title}\n{error_message}"):
+                print("  Sent API error notification to Slack.")
             return
         
         first_entries = self.get_first_check_in_times(webwork_data, date)
+        # Build the rosters once for the whole run instead of once per
+        # department inside the loop below.
+        department_employees = self.get_department_employees_from_webwork(webwork_data)
+        # One batchGet covers every department sheet instead of a
+        # get_all_values round trip per department.
+        sheet_snapshots = sheets_future.result()
         aggregated_results = {}
 
+        # Collect every department's formatting requests and submit them as
+        # one batch_update after the loop instead of one call per department.
+        # The batch is local to this run — groups may run concurrently on a
+        # shared reporter, so it is threaded down as a parameter rather than
+        # kept on the instance.
+        format_batch = []
+        # Conditional-formatting keys riding in format_batch; they only go
+        # into _cf_applied once the flush below succeeds.
+        cf_pending = []
         for department in departments_to_process:
             print(f"  Processing {department}...")
-            status_data = self._update_sheet_and_get_statuses(department, date, webwork_data, first_entries)
+            status_data = self._update_sheet_and_get_statuses(
+                department, date, department_employees.get(department, []), first_entries,
+                sheet_snapshot=sheet_snapshots.get(department), format_batch=format_batch,
+                cf_pending=cf_pending)
             if status_data:
                 aggregated_results[department] = status_data
                 print(f"    Found {len(status_data['present'])} present, {len(status_data['late'])} late, {len(status_data['absent'])} absent")
             else:
                 print(f"    No data for {department}")
 
+        if format_batch:
+            try:
+                self.spreadsheet.batch_update({"requests": format_batch})
+                self._cf_applied.update(cf_pending)
+            except Exception as e:
+                print(f"  Error applying sheet formatting: {e}", file=sys.stderr)
+
         if not aggregated_results:
             print("  No data found for any departments.")
             return
 
-        # Send one Slack message with all the results
+        # Send one Slack message with all the results; posting happens on the
+        # IO pool so it overlaps the email notifications below.
         report_title = f":loudspeaker: {run_type.title()} Attendance Report - {date.strftime('%Y-%m-%d')}"
-        self.slack_notifier.send_consolidated_report(report_title, aggregated_results, run_type)
-        
+        pending = [self._io_pool.submit(
+            self.slack_notifier.send_consolidated_report, report_title, aggregated_results, run_type)]
+
         # Send email notifications to late and absent employees
         if self.email_automation and run_type == 'eod':  # Send emails only during EOD report
             print("\n--- Email Notifications ---")
@@ -351,36 +560,91 @@ class AttendanceReportGenerator:
                 dept_start_times = {}
                 for dept in aggregated_results.keys():
                     start_time_str = DEPARTMENT_START_TIMES.get(dept, DEFAULT_START_TIME)
-                    start_dt = datetime.datetime.combine(date, datetime.datetime.strptime(start_time_str, "%H:%M").time(), tzinfo=self.tz)
+                    start_dt = datetime.datetime.combine(date, _parse_hm(start_time_str), tzinfo=self.tz)
                     dept_start_times[dept] = start_dt
                 
                 # Send batch notifications
                 self.email_automation.send_batch_notifications(aggregated_results, date, dept_start_times)
             except Exception as e:
                 print(f"Error sending email notifications: {e}")
-        
+
+        # Don't return (and potentially exit the process) with posts in
+        # flight; take each result so a failed post is logged, not swallowed.
+        for future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                print(f"  Error sending Slack report: {e}", file=sys.stderr)
         print(f"--- Consolidated {run_type.upper()} run complete ---")
 
-    def _update_sheet_and_get_statuses(self, department, date, webwork_data, first_entries):
+    def _load_worksheet_listing(self, departments):
+        """Populate the worksheet lookup, preferring the on-disk metadata cache.
+
+        Worksheet ids and titles change rarely, so they are persisted the
+        same way as the user cache; a fresh cache covering every requested
+        department rebuilds the Worksheet objects from stored properties
+        and skips the worksheets() listing round trip entirely."""
+        if self._worksheets_by_title is not None and all(d in self._worksheets_by_title for d in departments):
+            return
+
+        try:
+            if (os.path.exists(self.SHEET_META_CACHE_FILE)
+                    and time.time() - os.path.getmtime(self.SHEET_META_CACHE_FILE) < self.SHEET_META_CACHE_TTL):
+                with open(self.SHEET_META_CACHE_FILE, encoding='utf-8') as f:
+                    sheet_ids = json.load(f)
+                if all(d in sheet_ids for d in departments):
+                    self._worksheets_by_title = {
+                        title: gspread.Worksheet(self.spreadsheet, {'sheetId': sheet_id, 'title': title})
+                        for title, sheet_id in sheet_ids.items()
+                    }
+                    return
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable sheet metadata cache: {e}")
+
+        self._worksheets_by_title = {ws.title: ws for ws in self.spreadsheet.worksheets()}
+        try:
+            # Atomic write, mirroring the user cache
+            tmp_file = self.SHEET_META_CACHE_FILE + ".tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({title: ws.id for title, ws in self._worksheets_by_title.items()}, f)
+            os.replace(tmp_file, self.SHEET_META_CACHE_FILE)
+        except OSError as e:
+            print(f"Could not write sheet metadata cache: {e}")
+
+    def _prefetch_sheets(self, departments):
+        """Fetch every department sheet's values in one batchGet round trip.
+
+        Returns {department: rows}; departments without a worksheet yet map
+        to None so the caller can create them. Also caches the worksheet
+        listing so later lookups skip the per-department metadata call."""
+        self._load_worksheet_listing(departments)
+        existing = [d for d in departments if d in self._worksheets_by_title]
+        snapshots = {d: None for d in departments}
+        if existing:
+            response = self.spreadsheet.values_batch_get(ranges=[f"'{d}'!A1:ZZ" for d in existing])
+            for dept, value_range in zip(existing, response.get("valueRanges", [])):
+                snapshots[dept] = _SheetSnap(value_range.get("values", []))
+        return snapshots
+
+    def _update_sheet_and_get_statuses(self, department, date, employees, first_entries,
+                                       sheet_snapshot=None, format_batch=None, cf_pending=None):
         """Helper to contain the logic for processing one department's sheet."""
         try:
-            # Get department employees from WebWork data
-            department_employees = self.get_department_employees_from_webwork(webwork_data)
-            employees = department_employees.get(department, [])
-            
             if not employees:
                 print(f"  No employees found for {department}")
                 return None
-            
+
             # Calculate start time for this department
-            start_dt = datetime.datetime.combine(date, datetime.datetime.strptime(DEPARTMENT_START_TIMES.get(department, DEFAULT_START_TIME), "%H:%M").time(), tzinfo=self.tz)
-            
+            start_dt = datetime.datetime.combine(date, _parse_hm(DEPARTMENT_START_TIMES.get(department, DEFAULT_START_TIME)), tzinfo=self.tz)
+
             # Calculate statuses
             present, late, initially_absent, absent = self._calculate_statuses(employees, first_entries, start_dt)
-            
+
             # Update the Google Sheet
-            self._update_department_sheet(department, date, employees, first_entries, start_dt)
-            
+            self._update_department_sheet(department, date, employees, first_entries, start_dt,
+                                          sheet_snapshot=sheet_snapshot, format_batch=format_batch,
+                                          cf_pending=cf_pending)
+
             return {
                 "present": present, 
                 "late": late, 
@@ -391,20 +655,33 @@ class AttendanceReportGenerator:
             print(f"  Error processing {department}: {e}", file=sys.stderr)
             return None
 
-    def _update_department_sheet(self, department, date, employees, first_entries, start_dt):
-        """Update the Google Sheet for a specific department with attendance data."""
+    def _update_department_sheet(self, department, date, employees, first_entries, start_dt,
+                                 sheet_snapshot=None, format_batch=None, cf_pending=None):
+        """Update the Google Sheet for a specific department with attendance data.
+
+        When *format_batch* is given (consolidated runs), formatting and
+        validation requests are appended to it for the caller to flush in
+        one batch_update instead of being submitted here."""
         try:
             # Get or create the worksheet for this department
             try:
-                worksheet = self.spreadsheet.worksheet(department)
+                if self._worksheets_by_title is not None and department in self._worksheets_by_title:
+                    worksheet = self._worksheets_by_title[department]
+                else:
+                    worksheet = self.spreadsheet.worksheet(department)
                 print(f"    Using existing worksheet for {department}")
             except:
                 # Create new worksheet if it doesn't exist
                 worksheet = self.spreadsheet.add_worksheet(title=department, rows=1000, cols=10)
+                if self._worksheets_by_title is not None:
+                    self._worksheets_by_title[department] = worksheet
                 print(f"    Created new worksheet for {department}")
-            
-            # Get existing data to preserve structure
-            existing_data = worksheet.get_all_values()
+
+            # Get existing data to preserve structure (prefetched snapshot
+            # when the caller batch-fetched all departments up front)
+            if sheet_snapshot is None:
+                sheet_snapshot = _SheetSnap(worksheet.get_all_values())
+            existing_data = sheet_snapshot.rows
             date_str = date.strftime('%Y-%m-%d')
             
             if not existing_data:
@@ -423,95 +700,74 @@ class AttendanceReportGenerator:
             
             # Work with existing data structure
             print(f"    Working with existing data structure for {department}")
-            
+
+            # Pristine copy for the diff at the end: only cells that differ
+            # from this snapshot get uploaded.
+            original_data = [row[:] for row in existing_data]
+
             # Find the date column or create new one
             header_row = existing_data[0] if existing_data else ["Name", "Email"]
             
             # Check if date column already exists
-            date_col_index = None
-            for i, col in enumerate(header_row):
-                if col == date_str:
-                    date_col_index = i
-                    break
-            
+            date_col_index = sheet_snapshot.header_index.get(date_str)
+
             if date_col_index is None:
                 # Add new date column
                 date_col_index = len(header_row)
-                # Extend header row
                 header_row.append(date_str)
-                # Extend all data rows with empty cells
-                for i in range(1, len(existing_data)):
-                    while len(existing_data[i]) < len(header_row):
-                        existing_data[i].append("")
-            
+
             # Update header row
             existing_data[0] = header_row
-            
-            # Create a mapping of email to row index for existing data
-            email_to_row = {}
-            for i, row in enumerate(existing_data[1:], 1):
-                if len(row) > 1:
-                    email = row[1] if len(row) > 1 else ""
-                    if email:  # Only add non-empty emails
-                        email_to_row[email.lower().strip()] = i  # Normalize email for matching
-            
-            print(f"    Found {len(email_to_row)} existing employees in sheet")
-            
+
             # Create a mapping of WebWork employees for quick lookup
-            webwork_employees = {emp['email'].lower().strip(): emp for emp in employees}
+            webwork_employees = {emp['norm']: emp for emp in employees}
             print(f"    Found {len(webwork_employees)} employees with WebWork activity")
-            
-            # Update existing rows and add new employees
-            updated_employees = set()
+
+            # Update existing rows via the prebuilt email index; no re-scan
+            # or re-normalization of the sheet rows is needed.
             matched_employees = 0
             new_employees = 0
             preserved_employees = 0
-            
+
             # Process all existing employees in the sheet
-            for i, row in enumerate(existing_data[1:], 1):
-                if len(row) > 1:
-                    email = row[1] if len(row) > 1 else ""
-                    if email:
-                        normalized_email = email.lower().strip()
-                        
-                        # Ensure row has enough columns
-                        while len(existing_data[i]) < len(header_row):
-                            existing_data[i].append("")
-                        
-                        if normalized_email in webwork_employees:
-                            # Update with WebWork data
-                            emp = webwork_employees[normalized_email]
-                            existing_data[i][0] = emp['name']  # Update name
-                            
-                            # Update attendance status
-                            if normalized_email in first_entries:
-                                check_in = first_entries[normalized_email]
-                                minutes_late = int((check_in - start_dt).total_seconds() / 60)
-                                
-                                if minutes_late <= 5:
-                                    status = "Present"
-                                elif minutes_late <= 30:
-                                    status = "Late"
-                                else:
-                                    status = "Absent"
-                            else:
-                                status = "Absent"
-                            
-                            existing_data[i][date_col_index] = status
-                            updated_employees.add(normalized_email)
-                            matched_employees += 1
-                            print(f"      ✓ Updated {emp['name']} ({email}) - {status}")
+            for normalized_email, i in sheet_snapshot.email_index.items():
+                row = existing_data[i]
+
+                # Ensure row has enough columns
+                if len(row) < len(header_row):
+                    row.extend([""] * (len(header_row) - len(row)))
+
+                if normalized_email in webwork_employees:
+                    # Update with WebWork data
+                    emp = webwork_employees[normalized_email]
+                    row[0] = emp['name']  # Update name
+
+                    # Update attendance status
+                    if normalized_email in first_entries:
+                        check_in = first_entries[normalized_email]
+                        minutes_late = int((check_in - start_dt).total_seconds() / 60)
+
+                        if minutes_late <= 5:
+                            status = "Present"
+                        elif minutes_late <= 30:
+                            status = "Late"
                         else:
-                            # Employee exists in sheet but no WebWork activity today
-                            # Mark as absent for today
-                            existing_data[i][date_col_index] = "Absent"
-                            preserved_employees += 1
-                            print(f"      - Preserved {row[0]} ({email}) - Absent (no activity)")
-            
+                            status = "Absent"
+                    else:
+                        status = "Absent"
+
+                    row[date_col_index] = status
+                    matched_employees += 1
+                else:
+                    # Employee exists in sheet but no WebWork activity today
+                    # Mark as absent for today
+                    row[date_col_index] = "Absent"
+                    preserved_employees += 1
+
             # Add new employees from WebWork that don't exist in sheet
             for emp in employees:
-                normalized_email = emp['email'].lower().strip()
-                if normalized_email not in email_to_row:
+                normalized_email = emp['norm']
+                if normalized_email not in sheet_snapshot.email_index:
                     new_employees += 1
                     new_row = [emp['name'], emp['email']]
                     # Add empty cells for existing date columns
@@ -535,19 +791,56 @@ class AttendanceReportGenerator:
                             new_row.append("")
                     
                     existing_data.append(new_row)
-                    print(f"      + Added {emp['name']} ({emp['email']}) - {status}")
-            
-            # Update the sheet with all data
-            worksheet.clear()
-            worksheet.update(existing_data)
-            
-            # Apply formatting
-            self._format_header(worksheet)
-            self._apply_conditional_formatting(worksheet)
             
-            # Add dropdown validation to all date columns (except Name and Email)
-            for col_num in range(3, len(header_row) + 1):  # Start from column C (3)
-                self._add_dropdown_validation(worksheet, col_num)
+            # Upload only what changed: the typical delta is one new date
+            # column plus a few rows, so diffing against the fetched snapshot
+            # sends kilobytes instead of the full sheet history.
+            data_updates = []
+            original_row_count = len(original_data)
+            for r in range(original_row_count):
+                row = existing_data[r]
+                orig = original_data[r]
+                for c, value in enumerate(row):
+                    old = orig[c] if c < len(orig) else ""
+                    if value != old:
+                        data_updates.append({
+                            "range": f"'{department}'!{_col_to_a1(c + 1)}{r + 1}",
+                            "values": [[value]],
+                        })
+            appended_rows = existing_data[original_row_count:]
+            if appended_rows:
+                data_updates.append({
+                    "range": f"'{department}'!A{original_row_count + 1}",
+                    "values": appended_rows,
+                })
+
+            if data_updates:
+                # Header format + conditional formatting + validation as raw
+                # requests, plus one values write carrying just the diff.
+                requests = [self._format_header(worksheet.id, len(header_row))]
+                cf_key = (worksheet.id, len(header_row))
+                cf_requests = self._apply_conditional_formatting(worksheet.id, len(header_row))
+                requests.extend(cf_requests)
+                validation_request = self._add_dropdown_validation(worksheet.id, len(header_row))
+                if validation_request:
+                    requests.append(validation_request)
+                if format_batch is not None:
+                    # Consolidated run: defer so all departments share one
+                    # batch_update at the end of the run.
+                    format_batch.extend(requests)
+                    if cf_requests and cf_pending is not None:
+                        cf_pending.append(cf_key)
+                else:
+                    self.spreadsheet.batch_update({"requests": requests})
+                    if cf_requests:
+                        self._cf_applied.add(cf_key)
+
+                self.spreadsheet.values_batch_update({
+                    "valueInputOption": "USER_ENTERED",
+                    "data": data_updates,
+                })
+            else:
+                print(f"    No changes for {department}; skipping sheet write")
             
             print(f"    Updated sheet for {department}: {matched_employees} updated, {preserved_employees} preserved, {new_employees} new, {len(existing_data)-1} total employees")
             
@@ -556,171 +849,125 @@ class AttendanceReportGenerator:
             raise
 
     def process_department_and_notify(self, department, date, run_type, webwork_data, first_entries):
-        """Process a single department and send individual notification."""
+        """Process a single department and return its status data.
+
+        Posting is left to the caller so several departments can be folded
+        into one Slack message instead of one post per department."""
         print(f"Processing {department} for {run_type} report...")
-        
-        start_dt = datetime.datetime.combine(date, datetime.datetime.strptime(DEPARTMENT_START_TIMES.get(department, DEFAULT_START_TIME), "%H:%M").time(), tzinfo=self.tz)
-        
+
+        start_dt = datetime.datetime.combine(date, _parse_hm(DEPARTMENT_START_TIMES.get(department, DEFAULT_START_TIME)), tzinfo=self.tz)
+
         # Get department employees from WebWork data
         department_employees = self.get_department_employees_from_webwork(webwork_data)
         employees = department_employees.get(department, [])
-        
+
         if not employees:
             print(f"  No employees found for {department}")
-            return
-        
+            return None
+
         # Calculate statuses
         present, late, initially_absent, absent = self._calculate_statuses(employees, first_entries, start_dt)
-        
+
         # Update the Google Sheet
         self._update_department_sheet(department, date, employees, first_entries, start_dt)
-        
-        # Create status data for Slack notification
-        status_data = {
+
+        return {
             "present": present,
-            "late": late, 
+            "late": late,
             "initially_absent": initially_absent,
             "absent": absent
         }
-        
-        # Send individual department notification
-        report_title = f":loudspeaker: {run_type.title()} Attendance Report - {department} - {date.strftime('%Y-%m-%d')}"
-        self.slack_notifier.send_consolidated_report(report_title, {department: status_data}, run_type)
 
-    def generate_report(self, date, department):
-        """Wrapper to fetch data and process a single department for the initial run."""
+    def _run_single_department(self, date, department, run_type):
+        """Fetch data, process one department, and send its Slack report."""
         webwork_data = self.fetch_webwork_data(date.strftime('%Y-%m-%d'))
         first_entries = self.get_first_check_in_times(webwork_data, date)
-        self.process_department_and_notify(department, date, 'morning', webwork_data, first_entries)
+        status_data = self.process_department_and_notify(department, date, run_type, webwork_data, first_entries)
+        if status_data:
+            report_title = f":loudspeaker: {run_type.title()} Attendance Report - {department} - {date.strftime('%Y-%m-%d')}"
+            self.slack_notifier.send_consolidated_report(report_title, {department: status_data}, run_type)
+
+    def generate_report(self, date, department):
+        """Wrapper to fetch data and process a single department for the initial run."""
+        self._run_single_department(date, department, 'morning')
 
     def run_end_of_day_update(self, date, department):
         """Wrapper to fetch data and process a single department for the EOD run."""
-        webwork_data = self.fetch_webwork_data(date.strftime('%Y-%m-%d'))
-        first_entries = self.get_first_check_in_times(webwork_data, date)
-        self.process_department_and_notify(department, date, 'eod', webwork_data, first_entries)
+        self._run_single_department(date, department, 'eod')
+
+    def _format_header(self, sheet_id, col_count):
+        """Builds the repeatCell request that styles the header row."""
+        return {
+            "repeatCell": {
+                "range": {"sheetId": sheet_id, "startRowIndex": 0, "endRowIndex": 1,
+                          "startColumnIndex": 0, "endColumnIndex": col_count},
+                "cell": {"userEnteredFormat": {
+                    "backgroundColor": self.header_color,
+                    "textFormat": {"foregroundColor": {"red": 1, "green": 1, "blue": 1}, "bold": True}
+                }},
+                "fields": "userEnteredFormat(backgroundColor,textFormat)"
+            }
+        }
 
-    def _format_header(self, worksheet):
-        """Applies bold text and background color to the header row."""
-        try:
-            # Get current data to determine column range
-            data = worksheet.get_all_values()
-            if not data:
-                print("  No data to format header for.")
-                return
-            
-            header_row = data[0]
-            col_count = len(header_row)
-            
-            # Format the entire header row
-            range_notation = f'A1:{self._col_to_a1(col_count)}1'
-            worksheet.format(range_notation, {
-                "backgroundColor": self.header_color,
-                "textFormat": {"foregroundColor": {"red": 1, "green": 1, "blue": 1}, "bold": True}
+    def _apply_conditional_formatting(self, sheet_id, col_count):
+        """Builds addConditionalFormatRule requests for the attendance statuses.
+
+        One rule per status covering the whole date-column block, rather than
+        three rules per column. Callers record (sheet_id, col_count) in
+        _cf_applied only once the batch carrying these requests succeeds, so
+        a failed flush gets the rules re-submitted on the next run."""
+        if col_count <= 2:
+            return []
+
+        if (sheet_id, col_count) in self._cf_applied:
+            return []
+
+        status_colors = [
+            ("Present", self.present_color),
+            ("Late", self.late_color),
+            ("Absent", self.absent_color),
+        ]
+        requests = []
+        for index, (status, color) in enumerate(status_colors):
+            requests.append({
+                "addConditionalFormatRule": {
+                    "rule": {
+                        "ranges": [{"sheetId": sheet_id, "startRowIndex": 1,
+                                    "startColumnIndex": 2, "endColumnIndex": col_count}],
+                        "booleanRule": {
+                            "condition": {"type": "TEXT_EQ", "values": [{"userEnteredValue": status}]},
+                            "format": {"backgroundColor": color}
+                        }
+                    },
+                    "index": index
+                }
             })
-            print(f"  Formatted header row ({col_count} columns).")
-        except Exception as e:
-            print(f"  Could not format header. Error: {e}", file=sys.stderr)
+        return requests
 
-    def _apply_conditional_formatting(self, worksheet):
-        """Applies color-coded conditional formatting for attendance statuses."""
-        try:
-            # Get the current data to determine column range
-            data = worksheet.get_all_values()
-            if not data or len(data) < 2:
-                print("  No data to apply conditional formatting to.")
-                return
-            
-            header_row = data[0]
-            # Apply formatting to all date columns (columns 3 and beyond)
-            date_columns = []
-            for i, col in enumerate(header_row):
-                if i >= 2:  # Skip Name and Email columns
-                    date_columns.append(i)
-            
-            if not date_columns:
-                print("  No date columns found for conditional formatting.")
-                return
-            
-            rules = []
-            rule_index = 0
-            
-            for col_index in date_columns:
-                # Present - Green
-                rules.append({
-                    "ranges": [{"sheetId": worksheet.id, "startRowIndex": 1, "startColumnIndex": col_index, "endColumnIndex": col_index + 1}],
-                "booleanRule": {
-                    "condition": {"type": "TEXT_EQ", "values": [{"userEnteredValue": "Present"}]},
-                    "format": {"backgroundColor": self.present_color}
-                }
-                })
-                
-                # Late - Yellow
-                rules.append({
-                    "ranges": [{"sheetId": worksheet.id, "startRowIndex": 1, "startColumnIndex": col_index, "endColumnIndex": col_index + 1}],
-                "booleanRule": {
-                    "condition": {"type": "TEXT_EQ", "values": [{"userEnteredValue": "Late"}]},
-                    "format": {"backgroundColor": self.late_color}
-                }
-                })
-                
-                # Absent - Red
-                rules.append({
-                    "ranges": [{"sheetId": worksheet.id, "startRowIndex": 1, "startColumnIndex": col_index, "endColumnIndex": col_index + 1}],
-                "booleanRule": {
-                    "condition": {"type": "TEXT_EQ", "values": [{"userEnteredValue": "Absent"}]},
-                    "format": {"backgroundColor": self.absent_color}
-                }
-                })
-        
-            if rules:
-                requests = [{'addConditionalFormatRule': {'rule': rule, 'index': i}} for i, rule in enumerate(rules)]
-                worksheet.spreadsheet.batch_update({'requests': requests})
-                print(f"  Applied conditional formatting to {len(date_columns)} date columns.")
-            else:
-                print("  No conditional formatting rules to apply.")
-                
-        except Exception as e:
-            print(f"  Could not apply conditional formatting. Error: {e}", file=sys.stderr)
+    def _add_dropdown_validation(self, sheet_id, col_count):
+        """Builds one setDataValidation request covering every date column."""
+        if col_count <= 2:
+            return None
 
-    def _col_to_a1(self, col):
-        """Converts a 1-based column number to A1 notation (e.g., 1 -> A, 27 -> AA)."""
-        if col < 1:
-            raise ValueError("Column number must be 1 or greater.")
-        
-        result = ""
-        while col > 0:
-            col, remainder = divmod(col - 1, 26)
-            result = chr(65 + remainder) + result
-        return result
-
-    def _add_dropdown_validation(self, worksheet, col_num):
-        """Add dropdown data validation to a column using a compatible method."""
-        try:
-            validation_rule = {
-                "condition": {
-                    "type": "ONE_OF_LIST",
-                    "values": [{"userEnteredValue": option} for option in self.attendance_options]
+        validation_rule = {
+            "condition": {
+                "type": "ONE_OF_LIST",
+                "values": [{"userEnteredValue": option} for option in self.attendance_options]
+            },
+            "showCustomUi": True,
+            "strict": True
+        }
+        return {
+            "setDataValidation": {
+                "range": {
+                    "sheetId": sheet_id,
+                    "startRowIndex": 1,
+                    "startColumnIndex": 2,
+                    "endColumnIndex": col_count,
                 },
-                "showCustomUi": True,
-                "strict": True
+                "rule": validation_rule,
             }
-            
-            col_letter = self._col_to_a1(col_num)
-            requests = [{
-                "setDataValidation": {
-                    "range": {
-                        "sheetId": worksheet.id,
-                        "startRowIndex": 1,
-                        "startColumnIndex": col_num - 1,
-                        "endColumnIndex": col_num,
-                    },
-                    "rule": validation_rule,
-                }
-            }]
-            worksheet.spreadsheet.batch_update({"requests": requests})
-            print(f"  Added dropdown validation to column {col_letter}.")
-        except Exception as e:
-            print(f"  Could not set dropdown validation. Error: {e}", file=sys.stderr)
+        }
 
 def main():
     """Main function to trigger the report."""
@@ -736,21 +983,35 @@ def main():
     
     if args.test_week:
         print("--- Running Weekly Test Mode (with Sheet Updates & Slack Notifications) ---")
-        today = datetime.datetime.now(pytz.timezone(TIMEZONE)).date()
+        today = datetime.datetime.now(_TZ).date()
         start_of_week = today - datetime.timedelta(days=today.weekday())
         
-        current_day = start_of_week
-        while current_day <= today:
-            print(f"\n>>> Processing FULL DAY report for: {current_day.strftime('%A, %Y-%m-%d')}")
-            # In test mode, we process all departments for the day.
-            for dept in DEPARTMENTS_CONFIG.keys():
-                reporter.generate_report(current_day, dept)
-                reporter.run_end_of_day_update(current_day, dept)
-            current_day += datetime.timedelta(days=1)
+        # Departments are independent and dominated by Sheets/Slack
+        # roundtrips, so spread them over a pool — but each department's
+        # days must stay sequential: two days of the same sheet would both
+        # pick len(header_row) as their new date column and collide.
+        week_days = [
+            start_of_week + datetime.timedelta(days=offset)
+            for offset in range((today - start_of_week).days + 1)
+        ]
+
+        def _run_dept(dept):
+            for day in week_days:
+                print(f">>> Processing FULL DAY report for {dept} on {day.strftime('%A, %Y-%m-%d')}")
+                reporter.generate_report(day, dept)
+                reporter.run_end_of_day_update(day, dept)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            futures = {executor.submit(_run_dept, dept): dept for dept in DEPARTMENTS_CONFIG.keys()}
+            for future in concurrent.futures.as_completed(futures):
+                dept = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"    Error in weekly test for {dept}: {e}", file=sys.stderr)
         print("\n--- Weekly Test Mode Complete ---")
     else:
         print("This script is now designed to be run via the main.py scheduler or with the --test-week flag.")
 
 if __name__ == "__main__":
-    import argparse
     main() 
\ No newline at end of file
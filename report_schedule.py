@@ -0,0 +1,24 @@
+"""Shared reporting-group schedule for the entry-point scripts."""
+
+import collections
+import functools
+from config import DEPARTMENT_START_TIMES
+
+
+@functools.lru_cache(maxsize=1)
+def get_report_groups():
+    """Group departments by their scheduled report time (30 mins after start time).
+
+    Computed once per process and cached; every entry point shares the
+    result. Returns an immutable tuple of (time_str, departments) pairs
+    sorted by time — plain integer arithmetic on the HH:MM strings, no
+    datetime objects needed.
+    """
+    groups = collections.defaultdict(list)
+    for dept, start_time in DEPARTMENT_START_TIMES.items():
+        hour, minute = map(int, start_time.split(':'))
+        minute += 30
+        hour = (hour + minute // 60) % 24
+        minute %= 60
+        groups[f"{hour:02d}:{minute:02d}"].append(dept)
+    return tuple((time_str, tuple(depts)) for time_str, depts in sorted(groups.items()))
@@ -0,0 +1,247 @@
+"""Single entry-point module for the attendance reporting system.
+
+Consolidates the wiring that used to be duplicated across main.py,
+main_auto_run.py and main_full_run.py: one copy of the group-report
+runner, the scheduler setup, and the command-line dispatch. The old
+files remain as thin shims so existing invocations keep working.
+"""
+
+import argparse
+import atexit
+import concurrent.futures
+import datetime
+import logging
+import logging.handlers
+import queue
+import sys
+from zoneinfo import ZoneInfo
+from generate_report import AttendanceReportGenerator
+from config import DEPARTMENT_START_TIMES, DEPARTMENTS_CONFIG
+from report_schedule import get_report_groups
+
+# Loaded once; tz construction is not free and every runner needs it
+_NY_TZ = ZoneInfo('America/New_York')
+
+# Group reports run on worker threads; routing their messages through a
+# queue keeps log calls non-blocking and leaves the stdout writes to one
+# listener thread (same pattern as email_automation).
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _log_queue = queue.Queue(-1)
+    _stream_handler = logging.StreamHandler(sys.stdout)
+    _stream_handler.setFormatter(logging.Formatter('%(message)s'))
+    _log_listener = logging.handlers.QueueListener(_log_queue, _stream_handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+    logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def run_department_group_report(reporter, departments, run_type):
+    """
+    This is the new target for the scheduler. It runs the consolidated
+    report for a specific list of departments using a shared reporter, so
+    each group reuses the already-authenticated Sheets/Slack/Gmail clients.
+    """
+    logger.info(f"*** Kicking off {run_type.upper()} report for group: {', '.join(departments)} ***")
+    today = datetime.datetime.now(_NY_TZ).date()
+    reporter.run_consolidated_report(departments, today, run_type)
+    logger.info(f"*** Finished {run_type.upper()} report for group ***")
+
+
+def run_all_morning_reports():
+    """Run all morning reports for all department groups."""
+    print("\n".join(["=" * 60, "RUNNING ALL MORNING REPORTS", "=" * 60]))
+
+    reporter = AttendanceReportGenerator()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {
+            executor.submit(run_department_group_report, reporter, depts, 'morning'): depts
+            for report_time_str, depts in get_report_groups()
+        }
+        for future in concurrent.futures.as_completed(futures):
+            depts = futures[future]
+            try:
+                future.result()
+                print(f"--- Completed morning report for {', '.join(depts)} ---")
+            except Exception as e:
+                print(f"--- ERROR in morning report for {', '.join(depts)}: {e} ---")
+
+
+def run_end_of_day_report():
+    """Run the end-of-day report for all departments."""
+    print("\n".join(["=" * 60, "RUNNING END-OF-DAY REPORT", "=" * 60]))
+
+    reporter = AttendanceReportGenerator()
+    all_depts = list(DEPARTMENTS_CONFIG.keys())
+    print(f"\n--- Running EOD report for all {len(all_depts)} departments ---")
+    run_department_group_report(reporter, all_depts, 'eod')
+    print(f"--- Completed EOD report for all departments ---")
+
+
+def run_single_department_test():
+    """Run a test for a single department to verify functionality."""
+    print("\n".join(["=" * 60, "RUNNING SINGLE DEPARTMENT TEST", "=" * 60]))
+
+    # Test with IT Dept since it has a defined start time
+    test_dept = "IT Dept"
+    print(f"\n--- Testing single department: {test_dept} ---")
+    run_department_group_report(AttendanceReportGenerator(), [test_dept], 'morning')
+    print(f"--- Completed single department test for {test_dept} ---")
+
+
+def run_both_reports():
+    """Run the morning reports followed by the end-of-day report."""
+    run_all_morning_reports()
+    print("\n" + "=" * 60)
+    run_end_of_day_report()
+
+
+def run_complete_execution():
+    """
+    Run the complete attendance reporting system automatically.
+    This executes all morning reports and the end-of-day report.
+    """
+    logger.info("\n".join(["=" * 80, "ATTENDANCE TRACKER - COMPLETE AUTOMATIC EXECUTION", "=" * 80]))
+
+    # Get current date and time
+    now = datetime.datetime.now(_NY_TZ)
+    today = now.date()
+    current_time = now.time()
+    report_groups = get_report_groups()
+    # Authenticate once; every group report reuses the same clients
+    reporter = AttendanceReportGenerator()
+
+    # Banner assembled once and written with a single print; per-line
+    # prints are a syscall each when stdout is unbuffered (CI logs).
+    banner = [
+        f"Execution Date: {today.strftime('%A, %Y-%m-%d')}",
+        f"Execution Time: {current_time.strftime('%I:%M %p')} EST",
+        f"Total Departments: {len(DEPARTMENTS_CONFIG)}",
+        f"Department Groups: {len(report_groups)}",
+        "",
+        "Department Groups:",
+    ]
+    banner.extend(f"  {time_str}: {', '.join(depts)}" for time_str, depts in report_groups)
+    banner.extend(["", "=" * 80, "STARTING EXECUTION...", "=" * 80])
+    banner.extend(["", "=" * 60, "STEP 1: RUNNING ALL MORNING REPORTS", "=" * 60])
+    logger.info("\n".join(banner))
+
+    morning_success_count = 0
+    morning_total_count = len(report_groups)
+
+    # The group reports are dominated by Sheets/Slack/Gmail roundtrips, so
+    # run them in parallel and overlap the network latency across groups.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {
+            executor.submit(run_department_group_report, reporter, depts, 'morning'): depts
+            for report_time_str, depts in report_groups
+        }
+        for future in concurrent.futures.as_completed(futures):
+            depts = futures[future]
+            try:
+                future.result()
+                logger.info(f"--- Completed morning report for {', '.join(depts)} ---")
+                morning_success_count += 1
+            except Exception:
+                logger.exception(f"--- ERROR in morning report for {', '.join(depts)} ---")
+
+    logger.info(f"\nMorning Reports: {morning_success_count}/{morning_total_count} completed successfully")
+
+    # Step 2: Run end-of-day report
+    logger.info("\n".join(["", "=" * 60, "STEP 2: RUNNING END-OF-DAY REPORT", "=" * 60]))
+
+    try:
+        all_depts = list(DEPARTMENTS_CONFIG.keys())
+        logger.info(f"\n--- Running EOD report for all {len(all_depts)} departments ---")
+        run_department_group_report(reporter, all_depts, 'eod')
+        logger.info(f"--- Completed EOD report for all departments ---")
+        eod_success = True
+    except Exception:
+        logger.exception("--- ERROR in EOD report ---")
+        eod_success = False
+
+    # Summary
+    summary = [
+        "",
+        "=" * 80,
+        "EXECUTION SUMMARY",
+        "=" * 80,
+        f"Date: {today.strftime('%A, %Y-%m-%d')}",
+        f"Time: {current_time.strftime('%I:%M %p')} EST",
+        f"Morning Reports: {morning_success_count}/{morning_total_count} successful",
+        f"End-of-Day Report: {'✓ Success' if eod_success else '✗ Failed'}",
+        f"Total Departments Processed: {len(DEPARTMENTS_CONFIG)}",
+        "=" * 80,
+        "EXECUTION COMPLETE",
+        "=" * 80,
+    ]
+    logger.info("\n".join(summary))
+
+
+def run_scheduler():
+    """
+    Schedules and runs the consolidated, group-based attendance reporting jobs.
+    """
+    # Only the scheduler mode needs APScheduler; keep the other modes light.
+    from apscheduler.schedulers.blocking import BlockingScheduler
+
+    # One authenticated reporter shared by every scheduled job
+    reporter = AttendanceReportGenerator()
+    scheduler = BlockingScheduler(timezone='America/New_York')
+
+    print("--- Setting up consolidated morning schedules ---")
+    for report_time_str, depts in get_report_groups():
+        hour, minute = map(int, report_time_str.split(':'))
+        scheduler.add_job(
+            run_department_group_report,
+            'cron',
+            hour=hour,
+            minute=minute,
+            args=[reporter, depts, 'morning']
+        )
+        print(f"  • Scheduled morning report for {len(depts)} department(s) at {report_time_str} EST.")
+
+    # Schedule the single end-of-day job for ALL departments
+    all_depts = list(DEPARTMENTS_CONFIG.keys())
+    scheduler.add_job(run_department_group_report, 'cron', hour=17, minute=30, args=[reporter, all_depts, 'eod'])
+    print("\n--- Scheduled consolidated EOD full report for 5:30 PM EST ---")
+
+    print("\nScheduler is running. Press Ctrl+C to exit.")
+
+    try:
+        scheduler.start()
+    except (KeyboardInterrupt, SystemExit):
+        print("Scheduler stopped.")
+
+
+_DISPATCH = {
+    'schedule': run_scheduler,
+    'morning': run_all_morning_reports,
+    'eod': run_end_of_day_report,
+    'test': run_single_department_test,
+    'both': run_both_reports,
+    'complete': run_complete_execution,
+}
+
+
+def main(default_mode=None):
+    """Parse the run mode and dispatch to the matching runner.
+
+    The shim entry points pass their historical default (main.py ->
+    'schedule', main_auto_run.py -> 'complete') so existing invocations
+    without arguments behave as before.
+    """
+    parser = argparse.ArgumentParser(description="Run the attendance reporting system.")
+    parser.add_argument('mode', nargs='?' if default_mode else None,
+                        choices=sorted(_DISPATCH), default=default_mode,
+                        help="schedule: run the APScheduler loop, morning: all morning "
+                             "reports, eod: end-of-day report, test: single department "
+                             "test, both: morning then EOD, complete: full automatic run")
+    args = parser.parse_args()
+    _DISPATCH[args.mode]()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Setup script for Gmail OAuth authentication.
-Run this script once to authenticate and create the token.pickle file.
+Run this script once to authenticate and create the token.json file.
 """
 
 from email_automation import setup_gmail_oauth
@@ -22,7 +22,7 @@ def main():
     setup_gmail_oauth()
     
     # Check if token was created
-    if os.path.exists('token.pickle'):
+    if os.path.exists('token.json'):
         print("\n✅ Setup complete! Token file created.")
         print("Email automation is now ready to use.")
         print("\nNote: The system will send emails automatically during EOD reports to:")
@@ -134,9 +134,19 @@ def test_batch_notifications():
         }
     }
     
-    # Count notifications
-    total_late = sum(len(dept['late']) for dept in test_data.values())
-    total_absent = sum(len(dept['absent']) for dept in test_data.values())
+    # One pass over the departments: accumulate the counts and build the
+    # breakdown lines together, then emit them as a single print.
+    total_late = total_absent = 0
+    lines = []
+    for dept, data in test_data.items():
+        late, absent = data['late'], data['absent']
+        total_late += len(late)
+        total_absent += len(absent)
+        lines.append(f"\n{dept}:")
+        lines.append(f"  Late: {len(late)} employees")
+        lines.extend(f"    - {emp['name']} ({emp['email']}) - {emp['minutes_late']} min late" for emp in late)
+        lines.append(f"  Absent: {len(absent)} employees")
+        lines.extend(f"    - {emp['name']} ({emp['email']})" for emp in absent)
     
     print(f"Test data contains:")
     print(f"- {total_late} late employees")
@@ -144,14 +154,7 @@ def test_batch_notifications():
     print(f"Total emails that would be sent: {total_late + total_absent}")
     
     print("\nDepartment breakdown:")
-    for dept, data in test_data.items():
-        print(f"\n{dept}:")
-        print(f"  Late: {len(data['late'])} employees")
-        for emp in data['late']:
-            print(f"    - {emp['name']} ({emp['email']}) - {emp['minutes_late']} min late")
-        print(f"  Absent: {len(data['absent'])} employees")
-        for emp in data['absent']:
-            print(f"    - {emp['name']} ({emp['email']})")
+    print("\n".join(lines))
     
     print("\n✅ Batch notification logic test complete!")
 
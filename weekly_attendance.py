@@ -1,216 +1,481 @@
-import datetime
-import pytz
-import time
-import random
-from typing import Dict, List
-
-import gspread
-from gspread.exceptions import APIError
-from gspread_formatting import CellFormat, Color, format_cell_range, batch_updater
-
-from attendance_tracker import AttendanceTracker
-from config import (
-    TIMEZONE,
-    GOOGLE_SERVICE_ACCOUNT_FILE,
-    GOOGLE_SHEET_ID,
-    START_TIME,
-)
-
-# ---------------------------------------------------------------------
-# Rate-limit handling
-# ---------------------------------------------------------------------
-def with_retry(func):
-    """Decorator to handle rate-limiting with exponential backoff."""
-    def wrapper(*args, **kwargs):
-        max_retries = 5
-        retry_count = 0
-        base_delay = 2  # seconds
-
-        while True:
-            try:
-                return func(*args, **kwargs)
-            except APIError as e:
-                error_msg = str(e).lower()
-                rate_limited = any(msg in error_msg for msg in [
-                    "quota exceeded",
-                    "rate limit",
-                    "too many requests",
-                    "exceeds the limit",
-                    "request rate"
-                ])
-
-                if not rate_limited or retry_count >= max_retries:
-                    raise  # Re-raise if not rate-limited or max retries reached
-
-                retry_count += 1
-                # Exponential backoff with jitter
-                delay = (base_delay ** retry_count) + random.uniform(0.1, 1.0)
-                print(f"⚠️ Rate limit hit. Backing off for {delay:.1f} seconds (attempt {retry_count}/{max_retries})...")
-                time.sleep(delay)
-    return wrapper
-
-class WeeklyAttendance:
-    """Updates the current week's Google Sheet with attendance data.
-
-    If the script is run mid-week it will automatically back-fill previous
-    weekdays with real data (instead of marking them Absent)."""
-
-    # Column order in target worksheet
-    HEADER = [
-        "Employee Name",
-        "Monday",
-        "Tuesday",
-        "Wednesday",
-        "Thursday",
-        "Friday",
-    ]
-
-    # Colours (RGB 0-1 range)
-    YELLOW = Color(1.0, 1.0, 0.6)
-    RED = Color(1.0, 0.6, 0.6)
-    WHITE = Color(1.0, 1.0, 1.0)
-
-    def __init__(self):
-        self.tz = pytz.timezone(TIMEZONE)
-        self.tracker = AttendanceTracker()
-
-        # Authenticate with Google Sheets
-        self.gc = gspread.service_account(GOOGLE_SERVICE_ACCOUNT_FILE)
-        self.spread = self.gc.open_by_key(GOOGLE_SHEET_ID)
-
-    # ---------------------------------------------------------------------
-    # Sheet helpers
-    # ---------------------------------------------------------------------
-    def _week_bounds(self, date: datetime.date):
-        """Return Monday and Friday for the ISO week containing *date*."""
-        monday = date - datetime.timedelta(days=date.weekday())
-        friday = monday + datetime.timedelta(days=4)
-        return monday, friday
-
-    def _sheet_name_for_week(self, monday: datetime.date, friday: datetime.date) -> str:
-        return f"{monday.strftime('%d/%m/%Y')} - {friday.strftime('%d/%m/%Y')}"
-
-    @with_retry
-    def _get_or_create_week_sheet(self, monday: datetime.date, friday: datetime.date):
-        name = self._sheet_name_for_week(monday, friday)
-        try:
-            worksheet = self.spread.worksheet(name)
-        except gspread.WorksheetNotFound:
-            worksheet = self.spread.add_worksheet(title=name, rows="100", cols="10")
-            # Write headers
-            worksheet.update([self.HEADER])
-        return worksheet
-
-    @with_retry
-    def _ensure_employee_row(self, worksheet, employee_name: str) -> int:
-        """Ensure a row exists for *employee_name* and return its 1-indexed row number."""
-        names = worksheet.col_values(1)
-        if employee_name in names:
-            return names.index(employee_name) + 1  # 1-indexed
-        # Append new employee row
-        next_row = len(names) + 1
-        worksheet.update_cell(next_row, 1, employee_name)
-        return next_row
-
-    # ---------------------------------------------------------------------
-    # Google Sheets formatting helpers
-    # ---------------------------------------------------------------------
-    @with_retry
-    def _apply_background(self, worksheet, cell_range: str, color: Color):
-        fmt = CellFormat(backgroundColor=color)
-        format_cell_range(worksheet, cell_range, fmt)
-
-    # ---------------------------------------------------------------------
-    # Internal helpers to fill a single day
-    # ---------------------------------------------------------------------
-    def _fill_day(self, worksheet, day: datetime.date):
-        """Fetch WebWork data for *day* and write it into the sheet."""
-
-        # Skip weekends
-        if day.weekday() >= 5:
-            return
-
-        print(f"  ↳ Filling {day.strftime('%A %d %b')} …")
-
-        data = self.tracker.fetch_webwork_data(day.strftime("%Y-%m-%d"))
-        _, first_entries, hr_team_emails = self.tracker.get_joining_times(data, target_date=day)
-
-        col_idx = day.weekday() + 2  # Monday col 2 …
-        start_dt = datetime.datetime.combine(day, datetime.datetime.strptime(START_TIME, "%H:%M").time(), tzinfo=self.tz)
-
-        # Collect values and formatting first so we can batch the writes – this avoids
-        # blowing past the Sheets 60-writes/min quota.
-        cell_updates: list[gspread.Cell] = []
-        fmt_tasks: list[tuple[str, Color]] = []  # (A1 notation, color)
-
-        for email in hr_team_emails:
-            name = self.tracker.get_user_name(email)
-            row = self._ensure_employee_row(worksheet, name)
-            cell_a1 = gspread.utils.rowcol_to_a1(row, col_idx)
-
-            first_entry = first_entries.get(email)
-            if not first_entry:
-                value = "Absent"
-                colour = self.RED
-            else:
-                minutes_late = (first_entry - start_dt).total_seconds() / 60.0
-                time_str = first_entry.strftime("%I:%M %p")  # e.g., 12:15 AM
-                value = f"'{time_str}"  # leading apostrophe → keep as text
-                colour = self.YELLOW if minutes_late >= 5 else self.WHITE
-
-            # Stage the value update and the formatting change.
-            cell_updates.append(gspread.Cell(row, col_idx, value))
-            fmt_tasks.append((cell_a1, colour))
-
-        # --- Push all value updates in one request (with retry)
-        @with_retry
-        def batch_update_cells():
-            worksheet.update_cells(cell_updates, value_input_option="USER_ENTERED")
-
-        if cell_updates:
-            batch_update_cells()
-
-        # --- Push all formatting updates in a single batch request
-        if fmt_tasks:
-            try:
-                @with_retry
-                def apply_all_formatting():
-                    with batch_updater(worksheet.spreadsheet) as batch:
-                        for cell_a1, colour in fmt_tasks:
-                            self._apply_background(worksheet, cell_a1, colour)
-
-                apply_all_formatting()
-            except APIError as e:
-                # Ignore benign "Must specify at least one request" when no formatting changes are necessary
-                if "Must specify at least one request" not in str(e):
-                    raise
-
-    # ---------------------------------------------------------------------
-    # Core public API
-    # ---------------------------------------------------------------------
-    def update_until_date(self, date: datetime.date):
-        """Update all weekdays from Monday up to *date* (inclusive)."""
-
-        if date.weekday() >= 5:
-            print("Weekend – nothing to do.")
-            return
-
-        # Authenticate WebWork users once
-        self.tracker.fetch_user_info()
-
-        monday, friday = self._week_bounds(date)
-        worksheet = self._get_or_create_week_sheet(monday, friday)
-
-        current = monday
-        while current <= date:
-            self._fill_day(worksheet, current)
-            current += datetime.timedelta(days=1)
-
-        print("Week sheet updated successfully.")
-
-
-if __name__ == "__main__":
-    eastern = pytz.timezone("US/Eastern")
-    today_eastern = datetime.datetime.now(eastern).date()
-    updater = WeeklyAttendance()
-    updater.update_until_date(today_eastern) 
\ No newline at end of file
+import argparse
+import concurrent.futures
+import datetime
+import json
+import os
+import time
+import random
+import threading
+from typing import Dict, List
+from zoneinfo import ZoneInfo
+
+import gspread
+from gspread.exceptions import APIError
+
+from attendance_tracker import AttendanceTracker, _fmt_ampm
+from config import (
+    TIMEZONE,
+    GOOGLE_SERVICE_ACCOUNT_FILE,
+    GOOGLE_SHEET_ID,
+    START_TIME,
+)
+
+# Parsed once at import; strptime re-ran the format-string machinery for
+# every filled day.
+_START_TIME = datetime.time(*map(int, START_TIME.split(":")))
+
+# Day columns are always Monday..Friday; no need to run the generic
+# column-letter conversion for five known values.
+_COL_LETTERS = {2: "B", 3: "C", 4: "D", 5: "E", 6: "F"}
+
+# ---------------------------------------------------------------------
+# Rate-limit handling
+# ---------------------------------------------------------------------
+def _server_retry_hint(error) -> float:
+    """Seconds the API asked us to wait before retrying, or 0.0 if no hint."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return 0.0
+
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+
+    try:
+        details = response.json().get("error", {}).get("details", [])
+    except ValueError:
+        return 0.0
+    for detail in details:
+        delay = detail.get("retryDelay") or detail.get("retryInfo", {}).get("retryDelay")
+        if isinstance(delay, str) and delay.endswith("s"):
+            try:
+                return float(delay[:-1])
+            except ValueError:
+                pass
+    return 0.0
+
+
+# Shared circuit breaker: once the API confirms the quota window is
+# exhausted, every decorated call waits for the window to reopen instead
+# of independently burning its own retry ladder against a dead quota.
+_quota_lock = threading.Lock()
+_quota_reset_at = 0.0
+
+
+def with_retry(func):
+    """Decorator to handle rate-limiting with exponential backoff.
+
+    When the API response carries a Retry-After header or retryInfo delay,
+    the sleep honours it (never retrying before the server says the quota
+    window reopens) and the reopen time is shared across all decorated
+    calls; otherwise exponential backoff applies, capped at 60s so a deep
+    retry ladder can't stall for minutes."""
+    def wrapper(*args, **kwargs):
+        global _quota_reset_at
+        max_retries = 5
+        retry_count = 0
+        base_delay = 2  # seconds
+
+        while True:
+            # Respect a cooldown another call already established
+            wait = _quota_reset_at - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                return func(*args, **kwargs)
+            except APIError as e:
+                error_msg = str(e).lower()
+                rate_limited = any(msg in error_msg for msg in [
+                    "quota exceeded",
+                    "rate limit",
+                    "too many requests",
+                    "exceeds the limit",
+                    "request rate"
+                ])
+
+                if not rate_limited or retry_count >= max_retries:
+                    raise  # Re-raise if not rate-limited or max retries reached
+
+                retry_count += 1
+                # Server hint if present, exponential backoff with jitter otherwise
+                hint = _server_retry_hint(e)
+                backoff = min(base_delay * 2 ** (retry_count - 1), 60)
+                delay = max(hint, backoff) + random.uniform(0.1, 1.0)
+                if hint:
+                    with _quota_lock:
+                        _quota_reset_at = max(_quota_reset_at, time.monotonic() + hint)
+                print(f"⚠️ Rate limit hit. Backing off for {delay:.1f} seconds (attempt {retry_count}/{max_retries})...")
+                time.sleep(delay)
+    return wrapper
+
+class WeeklyAttendance:
+    """Updates the current week's Google Sheet with attendance data.
+
+    If the script is run mid-week it will automatically back-fill previous
+    weekdays with real data (instead of marking them Absent)."""
+
+    # Column order in target worksheet
+    HEADER = [
+        "Employee Name",
+        "Monday",
+        "Tuesday",
+        "Wednesday",
+        "Thursday",
+        "Friday",
+    ]
+
+    # Background payloads (RGB 0-1 range), built once and shared: the
+    # staging loop references these singletons instead of allocating a
+    # colour object plus a fresh dict per cell.
+    YELLOW = {"red": 1.0, "green": 1.0, "blue": 0.6}
+    RED = {"red": 1.0, "green": 0.6, "blue": 0.6}
+    WHITE = {"red": 1.0, "green": 1.0, "blue": 1.0}
+
+    # Past-day WebWork payloads are immutable, so they are cached on disk
+    # and re-runs only hit the network for today. Bump the version when the
+    # payload shape the tracker returns changes.
+    WEBWORK_CACHE_DIR = ".cache"
+    WEBWORK_CACHE_VERSION = 1
+
+    def __init__(self):
+        # zoneinfo zones are valid as tzinfo= directly (pytz needed
+        # .localize() to avoid LMT offsets) and match the tracker.
+        self.tz = ZoneInfo(TIMEZONE)
+        self.tracker = AttendanceTracker()
+
+        # Authenticate with Google Sheets
+        self.gc = gspread.service_account(GOOGLE_SERVICE_ACCOUNT_FILE)
+        self.spread = self.gc.open_by_key(GOOGLE_SHEET_ID)
+
+        # Worksheet listing fetched once; spread.worksheet(name) re-downloads
+        # the whole spreadsheet metadata on every call.
+        self._worksheets = {ws.title: ws for ws in self.spread.worksheets()}
+
+        # {worksheet id: {employee name: 1-indexed row}} — column A is read
+        # once per worksheet and kept in sync as rows are appended, instead
+        # of one col_values() read per employee per day.
+        self._row_index: Dict[int, Dict[str, int]] = {}
+
+    # ---------------------------------------------------------------------
+    # Sheet helpers
+    # ---------------------------------------------------------------------
+    def _week_bounds(self, date: datetime.date):
+        """Return Monday and Friday for the ISO week containing *date*."""
+        monday = date - datetime.timedelta(days=date.weekday())
+        friday = monday + datetime.timedelta(days=4)
+        return monday, friday
+
+    def _sheet_name_for_week(self, monday: datetime.date, friday: datetime.date) -> str:
+        return f"{monday.strftime('%d/%m/%Y')} - {friday.strftime('%d/%m/%Y')}"
+
+    @with_retry
+    def _get_or_create_week_sheet(self, monday: datetime.date, friday: datetime.date):
+        name = self._sheet_name_for_week(monday, friday)
+        worksheet = self._worksheets.get(name)
+        if worksheet is None:
+            worksheet = self.spread.add_worksheet(title=name, rows="100", cols="10")
+            # Write headers
+            worksheet.update([self.HEADER])
+            self._worksheets[name] = worksheet
+        return worksheet
+
+    @with_retry
+    def _get_row_index(self, worksheet) -> Dict[str, int]:
+        """Return the cached {employee name: row} map for *worksheet*,
+        reading column A from the API only on the first call."""
+        index = self._row_index.get(worksheet.id)
+        if index is None:
+            names = worksheet.col_values(1)
+            index = {name: i for i, name in enumerate(names, 1)}
+            self._row_index[worksheet.id] = index
+        return index
+
+    def _lookup_row(self, worksheet, employee_name: str) -> int:
+        """Return the 1-indexed row for *employee_name* from the cache.
+
+        Callers must have passed the name through _ensure_rows_bulk first."""
+        return self._row_index[worksheet.id][employee_name]
+
+    def _ensure_rows_bulk(self, worksheet, employee_names: List[str]):
+        """Stage name cells for every employee not yet in the sheet.
+
+        Returns one updateCells request covering all missing names as a
+        contiguous block (or None when there are none) and records their
+        rows in the cache immediately, so day staging can reference the
+        rows before anything has been flushed to the API."""
+        index = self._get_row_index(worksheet)
+        missing = [name for name in employee_names if name not in index]
+        if not missing:
+            return None
+        # Dedup while keeping first-seen order
+        missing = list(dict.fromkeys(missing))
+        next_row = max(index.values(), default=0) + 1
+        for i, name in enumerate(missing):
+            index[name] = next_row + i
+        return {
+            "updateCells": {
+                "rows": [{"values": [{"userEnteredValue": {"stringValue": name}}]}
+                         for name in missing],
+                "fields": "userEnteredValue",
+                "start": {
+                    "sheetId": worksheet.id,
+                    "rowIndex": next_row - 1,
+                    "columnIndex": 0,
+                },
+            }
+        }
+
+    def _cache_path(self, day: datetime.date) -> str:
+        date_str = day.strftime("%Y-%m-%d")
+        return os.path.join(self.WEBWORK_CACHE_DIR,
+                            f"webwork-v{self.WEBWORK_CACHE_VERSION}-{date_str}.json")
+
+    def _read_cached_day(self, day: datetime.date):
+        """Return the cached payload for *day*, or None on a miss."""
+        try:
+            with open(self._cache_path(day), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None  # missing or torn cache file
+
+    def _write_cached_day(self, day: datetime.date, data):
+        try:
+            os.makedirs(self.WEBWORK_CACHE_DIR, exist_ok=True)
+            # Atomic write so a crash mid-dump can't leave a torn file
+            path = self._cache_path(day)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Could not write WebWork cache for {day}: {e}")
+
+    def _fetch_day_data(self, day: datetime.date, refresh: bool = False):
+        """Fetch WebWork data for *day*, serving past days from the disk cache."""
+        cacheable = day < datetime.datetime.now(self.tz).date()
+
+        if cacheable and not refresh:
+            cached = self._read_cached_day(day)
+            if cached is not None:
+                return cached
+
+        data = self.tracker.fetch_webwork_data(day.strftime("%Y-%m-%d"))
+
+        if cacheable and data:
+            self._write_cached_day(day, data)
+        return data
+
+    @with_retry
+    def _fetch_day_state(self, worksheet, col_idx: int):
+        """Return ({row: value}, {row: rgb tuple}) for one day's column.
+
+        Read once per day so re-runs can skip cells that already hold the
+        right value and colour instead of rewriting the whole column."""
+        col_letter = _COL_LETTERS[col_idx]
+        day_range = f"'{worksheet.title}'!{col_letter}2:{col_letter}"
+
+        values: Dict[int, str] = {}
+        resp = self.spread.values_get(day_range)
+        for row, cells in enumerate(resp.get("values", []), 2):
+            if cells:
+                values[row] = cells[0]
+
+        colours: Dict[int, dict] = {}
+        meta = self.spread.fetch_sheet_metadata(params={
+            "ranges": [day_range],
+            "fields": "sheets.data.rowData.values.userEnteredFormat.backgroundColor",
+        })
+        try:
+            row_data = meta["sheets"][0]["data"][0].get("rowData", [])
+        except (KeyError, IndexError):
+            row_data = []
+        for row, entry in enumerate(row_data, 2):
+            cells = entry.get("values") or [{}]
+            background = cells[0].get("userEnteredFormat", {}).get("backgroundColor")
+            if background is not None:
+                colours[row] = {"red": background.get("red", 0.0),
+                                "green": background.get("green", 0.0),
+                                "blue": background.get("blue", 0.0)}
+        return values, colours
+
+    # ---------------------------------------------------------------------
+    # Google Sheets formatting helpers
+    # ---------------------------------------------------------------------
+    def _build_day_requests(self, worksheet, col_idx: int, staged):
+        """Build the updateCells requests for one day's values and colours.
+
+        updateCells carries both userEnteredValue and the background colour
+        per cell. Contiguous rows share one request; gaps start a new one.
+        The caller collects the week's requests and flushes them together."""
+        requests: list = []
+        for row, value, colour in sorted(staged, key=lambda t: t[0]):
+            cell = {
+                "userEnteredValue": {"stringValue": value},
+                "userEnteredFormat": {"backgroundColor": colour},
+            }
+            if requests:
+                prev = requests[-1]["updateCells"]
+                if prev["start"]["rowIndex"] + len(prev["rows"]) == row - 1:
+                    prev["rows"].append({"values": [cell]})
+                    continue
+            requests.append({
+                "updateCells": {
+                    "rows": [{"values": [cell]}],
+                    "fields": "userEnteredValue,userEnteredFormat.backgroundColor",
+                    "start": {
+                        "sheetId": worksheet.id,
+                        "rowIndex": row - 1,
+                        "columnIndex": col_idx - 1,
+                    },
+                }
+            })
+        return requests
+
+    @with_retry
+    def _flush_requests(self, requests):
+        """Send the whole week's staged requests in one batchUpdate."""
+        self.spread.batch_update({"requests": requests})
+
+    # ---------------------------------------------------------------------
+    # Internal helpers to fill a single day
+    # ---------------------------------------------------------------------
+    def _stage_day(self, worksheet, day: datetime.date, data) -> list:
+        """Build the batchUpdate requests for *day* from pre-fetched *data*."""
+
+        # Skip weekends
+        if day.weekday() >= 5:
+            return []
+
+        # A failed fetch yields no data; staging it anyway would mark the
+        # whole additional-HR list Absent and overwrite good cells.
+        if not data:
+            print(f"  ⚠️  No WebWork data for {day.strftime('%A %d %b')} — skipping")
+            return []
+
+        print(f"  ↳ Staging {day.strftime('%A %d %b')} …")
+
+        joining_times, first_entries, hr_team_emails = self.tracker.get_joining_times(data, target_date=day)
+
+        col_idx = day.weekday() + 2  # Monday col 2 …
+        start_dt = datetime.datetime.combine(day, _START_TIME, tzinfo=self.tz)
+
+        # Collect values and colours first so everything for the day goes up
+        # in one batched write – this avoids blowing past the Sheets
+        # 60-writes/min quota.
+        staged: list[tuple[int, str, dict]] = []  # (row, value, background)
+
+        requests: list = []
+
+        # get_joining_times already resolved one (name, email) row per team
+        # member, so reuse those instead of a second get_user_name pass.
+        # One staged block covers every employee missing a row, before the
+        # per-employee loop stages its cell updates.
+        name_request = self._ensure_rows_bulk(worksheet, [entry.name for entry in joining_times])
+        if name_request:
+            requests.append(name_request)
+
+        # Current column state, read once: re-runs of an already-filled day
+        # then stage nothing and skip the write entirely.
+        existing_values, existing_colours = self._fetch_day_state(worksheet, col_idx)
+
+        for entry in joining_times:
+            row = self._lookup_row(worksheet, entry.name)
+
+            first_entry = first_entries.get(entry.email)
+            if not first_entry:
+                value = "Absent"
+                colour = self.RED
+            else:
+                minutes_late = (first_entry - start_dt).total_seconds() / 60.0
+                # stringValue is stored as literal text, so no leading
+                # apostrophe is needed to stop Sheets parsing it as a time.
+                value = _fmt_ampm(first_entry)  # e.g., 12:15 AM
+                colour = self.YELLOW if minutes_late >= 5 else self.WHITE
+
+            if (existing_values.get(row) == value
+                    and existing_colours.get(row) == colour):
+                continue  # cell already correct — nothing to write
+            staged.append((row, value, colour))
+
+        requests.extend(self._build_day_requests(worksheet, col_idx, staged))
+        return requests
+
+    # ---------------------------------------------------------------------
+    # Core public API
+    # ---------------------------------------------------------------------
+    def update_until_date(self, date: datetime.date, refresh: bool = False):
+        """Update all weekdays from Monday up to *date* (inclusive).
+
+        Pass refresh=True to bypass the on-disk WebWork cache."""
+
+        if date.weekday() >= 5:
+            print("Weekend – nothing to do.")
+            return
+
+        # Authenticate WebWork users once
+        self.tracker.fetch_user_info()
+
+        monday, friday = self._week_bounds(date)
+        worksheet = self._get_or_create_week_sheet(monday, friday)
+
+        days = [monday + datetime.timedelta(days=i) for i in range((date - monday).days + 1)]
+        today = datetime.datetime.now(self.tz).date()
+
+        # Serve immutable past days from the disk cache first.
+        day_data = {}
+        if not refresh:
+            for day in days:
+                if day < today:
+                    cached = self._read_cached_day(day)
+                    if cached is not None:
+                        day_data[day] = cached
+
+        # One range request covers everything the cache didn't; when the
+        # payload can't be split by day the tracker returns None and the
+        # concurrent per-day fetch below picks up the slack.
+        missing = [d for d in days if d not in day_data]
+        if len(missing) > 1:
+            by_day = self.tracker.fetch_webwork_data_range(
+                missing[0].strftime("%Y-%m-%d"), missing[-1].strftime("%Y-%m-%d"))
+            if by_day is not None:
+                for day in missing:
+                    data = by_day.get(day.strftime("%Y-%m-%d"))
+                    if data is not None:
+                        day_data[day] = data
+                        if day < today:
+                            self._write_cached_day(day, data)
+
+        missing = [d for d in days if d not in day_data]
+        if missing:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+                fetched = executor.map(lambda d: self._fetch_day_data(d, refresh=refresh), missing)
+                day_data.update(zip(missing, fetched))
+
+        # Stage every day first, then write the whole week in one
+        # batchUpdate — one write request on a Friday backfill instead of
+        # five, and the week lands atomically.
+        all_requests = []
+        for day in days:
+            all_requests.extend(self._stage_day(worksheet, day, day_data.get(day)))
+
+        if all_requests:
+            self._flush_requests(all_requests)
+        else:
+            print("Everything already up to date — nothing to write.")
+
+        print("Week sheet updated successfully.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fill the current week's attendance sheet.")
+    parser.add_argument('--refresh', action='store_true',
+                        help="Re-fetch past days from WebWork instead of the disk cache.")
+    args = parser.parse_args()
+
+    eastern = ZoneInfo("US/Eastern")
+    today_eastern = datetime.datetime.now(eastern).date()
+    updater = WeeklyAttendance()
+    updater.update_until_date(today_eastern, refresh=args.refresh)